@@ -0,0 +1,77 @@
+import json
+import os
+import socket
+import sys
+from typing import Iterable, Iterator
+
+# Thin client for moltbook_daemon.py. Standard library only and no tool
+# imports, so a call costs interpreter start-up plus one socket round trip.
+#
+#   moltbook_client.py TOOL [ARGS_JSON]    run one tool, print its result
+#   moltbook_client.py --batch [FILE]      forward JSON lines (file or stdin),
+#                                          print one result line per call
+#   moltbook_client.py --status            daemon pid, uptime and counters
+#
+# Uses the daemon's default socket, or MOLTBOOK_DAEMON_SOCKET if set.
+
+_STATE_DIR = os.environ.get("MOLTBOOK_STATE_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", ".moltbook-state"
+)
+_USAGE = "usage: moltbook_client.py TOOL [ARGS_JSON] | --batch [FILE] | --status"
+
+SOCKET_PATH = os.environ.get("MOLTBOOK_DAEMON_SOCKET") or os.path.join(
+    os.path.normpath(_STATE_DIR), "daemon.sock"
+)
+
+
+def _connect() -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(SOCKET_PATH)
+    except OSError as e:
+        sys.exit(
+            f"moltbook_client: daemon not reachable at {SOCKET_PATH} ({e}). "
+            "Start it with: ./moltbook_daemon.sh serve"
+        )
+    return sock
+
+
+def _exchange(lines: Iterable[str]) -> Iterator[str]:
+    """Send *lines*, then yield every reply line until the daemon closes."""
+    with _connect() as sock:
+        with sock.makefile("wb") as out:
+            for line in lines:
+                out.write(line.rstrip("\n").encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("rb") as replies:
+            for reply in replies:
+                yield reply.decode("utf-8").rstrip("\n")
+
+
+def main(argv: list[str]) -> int:
+    if not argv or argv[0] in ("-h", "--help"):
+        print(_USAGE)
+        return 0 if argv else 2
+    if argv[0] == "--status":
+        for reply in _exchange(['{"op": "status"}']):
+            print(reply)
+        return 0
+    if argv[0] == "--batch":
+        source = open(argv[1], "r", encoding="utf-8") if len(argv) > 1 and argv[1] != "-" else sys.stdin
+        with source:
+            for reply in _exchange(source):
+                print(reply, flush=True)
+        return 0
+
+    call = json.dumps({"tool": argv[0], "args": json.loads(argv[1]) if len(argv) > 1 else {}})
+    for reply in _exchange([call]):
+        record = json.loads(reply)
+        if "error" in record:
+            print(f"moltbook_client: {record['error']}", file=sys.stderr)
+            return 1
+        print(record["result"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
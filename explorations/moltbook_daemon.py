@@ -0,0 +1,210 @@
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+import moltbook_tools
+from tools.moltbook.helpers import manifest, profiles
+from tools.moltbook.helpers.local_state import state_dir
+
+# Long-running process that keeps everything a tool call needs warm: the
+# imported tool modules, the pooled HTTP client and its open connections,
+# the service token headers (api.AUTH_CACHE_S) that every tool, mutations
+# included, builds its requests from, the verification LLM client
+# (mutation_loop.LLM_CACHE_S) and solver, and the in-memory tier of the
+# response cache. Clients talk to it over a Unix-domain socket with the same
+# JSON lines as `moltbook_tools.py batch`: one call per line in, one result
+# line out as each call finishes. A line {"op": "status"} returns uptime and
+# counters instead of running a tool.
+#
+#   ./moltbook_daemon.sh serve &
+#   ./moltbook_client.sh get_data '{"path": "/home"}'
+#
+# The socket is created mode 0600 in the local state directory; override
+# its path with --socket or MOLTBOOK_DAEMON_SOCKET.
+#
+# Every call acts as the one account whose service token the daemon loaded.
+# Each connection gets its own tool session_data (session memory, ...);
+# only our resolved identity is shared between connections.
+
+DEFAULT_SOCKET = os.environ.get("MOLTBOOK_DAEMON_SOCKET") or os.path.join(state_dir(), "daemon.sock")
+
+# Imported at start-up rather than by the first call that needs them (tool
+# modules defer these, see tools/moltbook/__init__.py).
+_WARM_MODULES = (
+    "tools.moltbook.helpers.api",
+    "tools.moltbook.helpers.mutation_loop",
+    "src.data",
+    "src.utils.http.helpers",
+    "src.utils.llm.streaming",
+)
+
+_started = time.time()
+_calls = 0
+_calls_lock = threading.Lock()
+
+# profiles.SESSION_KEY entry, once any connection has resolved it.
+_identity: dict | None = None
+
+
+def _status() -> dict:
+    from tools.moltbook.helpers import api
+
+    return {
+        "op": "status",
+        "pid": os.getpid(),
+        "uptime_s": round(time.time() - _started, 1),
+        "calls": _calls,
+        "requests_last_minute": api.requests_last_minute(),
+    }
+
+
+def _is_status(line: str) -> bool:
+    if not line.startswith("{") or '"op"' not in line:
+        return False
+    try:
+        return json.loads(line).get("op") == "status"
+    except (ValueError, AttributeError):
+        return False
+
+
+def _new_session() -> dict:
+    return {profiles.SESSION_KEY: dict(_identity)} if _identity else {}
+
+
+def _share_identity(session: dict) -> None:
+    global _identity
+    identity = session.get(profiles.SESSION_KEY)
+    if _identity is None and isinstance(identity, dict) and identity.get("name"):
+        _identity = dict(identity)
+
+
+def _warm_up() -> None:
+    """Import and initialise what the first call would otherwise pay for."""
+    for module in _WARM_MODULES:
+        importlib.import_module(module)
+    for name in manifest.load_manifest():
+        manifest.load_tool(name)
+
+    from tools.moltbook.helpers import api
+
+    api.shared_client()
+    _, error = api.load_auth_headers("daemon")
+    if error:
+        click.echo(f"{error} (tools will report it per call)", err=True)
+
+    from tools.moltbook.helpers import mutation_loop
+
+    _, error = mutation_loop.verification_llm("daemon")
+    if error:
+        click.echo(f"{error} (mutations will report it per call)", err=True)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Runs each line of one connection on the server's pool, replying as calls finish."""
+
+    def handle(self):
+        global _calls
+        write_lock = threading.Lock()
+        pending = []
+        session = _new_session()
+
+        def reply(record: dict) -> None:
+            with write_lock:
+                try:
+                    self.wfile.write((json.dumps(record) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                except OSError:
+                    pass  # client went away; the call itself still completed
+
+        def run(number: int, line: str) -> None:
+            # Reply from the task itself: done-callbacks may still be running
+            # when result() returns, after the connection is closed.
+            record = moltbook_tools._run_line(number, line, session)
+            _share_identity(session)
+            reply(record)
+
+        for number, raw in enumerate(self.rfile, start=1):
+            line = raw.decode("utf-8").strip()
+            if not line or line.startswith("#"):
+                continue
+            if _is_status(line):
+                reply(_status())
+                continue
+            with _calls_lock:
+                _calls += 1
+            pending.append(self.server.pool.submit(run, number, line))
+        for future in pending:
+            future.result()
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, concurrency: int):
+        self.pool = ThreadPoolExecutor(max_workers=concurrency)
+        umask = os.umask(0o177)  # socket file is created 0600
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+
+
+def _claim_socket(path: str) -> None:
+    """Remove a stale socket file; exit if another daemon is listening on it."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    click.echo(f"moltbook_daemon: already running on {path}", err=True)
+    sys.exit(1)
+
+
+@click.group()
+def main():
+    pass
+
+
+@main.command()
+@click.option("--socket", "socket_path", type=str, default=DEFAULT_SOCKET, show_default=True)
+@click.option("--concurrency", type=click.IntRange(1, 64), default=8, show_default=True, help="Calls in flight at once, across all clients.")
+def serve(socket_path, concurrency):
+    """Listen for tool calls until interrupted."""
+    _claim_socket(socket_path)
+    started = time.perf_counter()
+    _warm_up()
+    server = _Server(socket_path, concurrency)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    click.echo(
+        f"moltbook_daemon: pid {os.getpid()} listening on {socket_path} "
+        f"(warm-up {time.perf_counter() - started:.2f} s)",
+        err=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.pool.shutdown(wait=True)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    main()
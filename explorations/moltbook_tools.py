@@ -0,0 +1,193 @@
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from tools.moltbook import TOOL_NAMESPACE
+from tools.moltbook.helpers import manifest
+
+# Runs Moltbook tools outside the agent loop:
+#
+#   ./moltbook_tools.sh list
+#   ./moltbook_tools.sh run get_data '{"path": "/home"}'
+#   ./moltbook_tools.sh batch calls.jsonl --concurrency 8 > results.jsonl
+#
+# batch reads one call per line from a file or stdin:
+#   {"tool": "search_many", "args": {"queries": ["x", "y"]}, "id": "opt"}
+#   /posts/abc123/comments        (shorthand for get_data with that path)
+# Blank lines and lines starting with '#' are skipped. "tool" defaults to
+# get_data and may carry the moltbook_ prefix. Calls run concurrently in one
+# process, so they share the pooled HTTP client, the loaded token and the
+# response cache; one JSON line per call is written as it finishes.
+#
+# The API allows api.REQUESTS_PER_MINUTE requests per minute. batch starts
+# at most --rate calls per minute (token bucket, bursting up to
+# --concurrency), and no call starts while this process has already made
+# that many requests in the last minute, so a large file slows down instead
+# of running into 429s.
+
+session_data: dict = {}
+
+_out_lock = threading.Lock()
+
+
+def _tool_name(name: str) -> str:
+    prefix = TOOL_NAMESPACE + "_"
+    return name[len(prefix):] if name.startswith(prefix) else name
+
+
+def _parse_line(line: str) -> dict:
+    """{"tool", "args", "id"} for one input line; raises ValueError if malformed."""
+    if line.startswith("/"):
+        return {"tool": "get_data", "args": {"path": line}, "id": None}
+    call = json.loads(line)
+    if not isinstance(call, dict):
+        raise ValueError("expected a JSON object or an API path")
+    args = call.get("args") or {}
+    if not isinstance(args, dict):
+        raise ValueError("'args' must be an object")
+    return {"tool": _tool_name(str(call.get("tool") or "get_data")), "args": args, "id": call.get("id")}
+
+
+class _RateLimit:
+    """Token bucket: *per_minute* call starts a minute, up to *burst* at once."""
+
+    def __init__(self, per_minute: int, burst: int) -> None:
+        self.interval = 60.0 / per_minute
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.interval)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) * self.interval
+            time.sleep(delay)
+
+
+def _wait_for_budget() -> None:
+    """Block while this process has used the API's per-minute request budget."""
+    from tools.moltbook.helpers import api
+
+    while api.requests_last_minute() >= api.REQUESTS_PER_MINUTE:
+        time.sleep(1)
+
+
+def run_tool(name: str, args: dict, session: dict | None = None) -> str:
+    """Execute tool *name* with *args*, importing its module on first use.
+
+    *session* is the tool session_data; defaults to this process's.
+    """
+    return manifest.load_tool(_tool_name(name)).execute(
+        args, session_data if session is None else session
+    )
+
+
+def _run_line(
+    number: int,
+    line: str,
+    session: dict | None = None,
+    rate: _RateLimit | None = None,
+) -> dict:
+    out: dict = {"line": number}
+    try:
+        call = _parse_line(line)
+    except ValueError as e:
+        return {**out, "error": f"bad input: {e}"}
+    out.update(id=call["id"], tool=call["tool"])
+    if call["tool"] not in manifest.load_manifest():
+        return {**out, "error": f"unknown tool {call['tool']!r}"}
+    if rate is not None:
+        rate.wait()
+    _wait_for_budget()
+    started = time.perf_counter()
+    try:
+        out["result"] = run_tool(call["tool"], call["args"], session)
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    out["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return out
+
+
+def _emit(record: dict) -> None:
+    with _out_lock:
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
+
+
+@click.group()
+def main():
+    pass
+
+
+@main.command("list")
+def list_tools():
+    """List the available tools, one JSON line each."""
+    for name, entry in manifest.load_manifest().items():
+        _emit({
+            "tool": name,
+            "qualified_name": entry["qualified_name"],
+            "needs_approval": entry["needs_approval"] is not None,
+            "description": entry["definition"]["function"].get("description", ""),
+        })
+
+
+@main.command()
+@click.argument("tool", type=str)
+@click.argument("args", type=str, default="{}")
+def run(tool, args):
+    """Run one TOOL with ARGS (a JSON object) and print its result."""
+    try:
+        parsed = json.loads(args)
+    except ValueError as e:
+        raise click.BadParameter(f"not valid JSON: {e}", param_hint="ARGS")
+    record = _run_line(1, json.dumps({"tool": tool, "args": parsed}))
+    if "error" in record:
+        click.echo(f"moltbook_tools: {record['error']}", err=True)
+        sys.exit(1)
+    click.echo(record["result"])
+
+
+@main.command()
+@click.argument("source", type=click.File("r"), default="-")
+@click.option("--concurrency", type=click.IntRange(1, 64), default=8, show_default=True, help="Calls in flight at once.")
+@click.option("--ordered", is_flag=True, help="Write results in input order instead of as they finish.")
+@click.option("--rate", type=click.IntRange(1, None), default=None, help="Most calls started per minute. Defaults to the API's request budget.")
+def batch(source, concurrency, ordered, rate):
+    """Run every call in SOURCE (a file, or - for stdin) concurrently."""
+    lines = [
+        (number, line.strip())
+        for number, line in enumerate(source, start=1)
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+    from tools.moltbook.helpers.api import REQUESTS_PER_MINUTE
+
+    limit = _RateLimit(rate or REQUESTS_PER_MINUTE, burst=concurrency)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(_run_line, number, line, None, limit) for number, line in lines]
+        if ordered:
+            for future in futures:
+                _emit(future.result())
+        else:
+            for future in futures:
+                future.add_done_callback(lambda f: _emit(f.result()))
+    failed = sum("error" in future.result() for future in futures)
+    click.echo(
+        f"{len(lines)} calls, {failed} failed, {time.perf_counter() - started:.2f} s",
+        err=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import click
+
+# Measures what `slbp ui run --load-tools` pays to register the Moltbook
+# tools: each tool module is imported in a fresh interpreter (so nothing is
+# already cached in sys.modules), and the heavy dependencies that import
+# pulled in are listed. Tool modules should only need their DEFINITION at
+# registration; anything listed under "heavy" is loaded too early.
+#
+#   ./__inenv python explorations/tool_import_benchmark.py --repeat 5
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+_TOOLS_DIR = os.path.join(_ROOT, "tools", "moltbook")
+
+HEAVY_MODULES = (
+    "httpx",
+    "src.data",
+    "src.utils.http.helpers",
+    "src.utils.llm.streaming",
+    "src.utils.sql.kv_manager",
+    "tools.moltbook.helpers.api",
+    "tools.moltbook.helpers.mutation_loop",
+)
+
+_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in sys.argv[2:]:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+heavy = json.loads(sys.argv[1])
+print(json.dumps({"ms": elapsed * 1000, "heavy": [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def _tool_modules() -> list[str]:
+    return sorted(
+        "tools.moltbook." + name[:-3]
+        for name in os.listdir(_TOOLS_DIR)
+        if name.endswith(".py") and not name.startswith("_")
+    )
+
+
+def _probe(modules: list[str]) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, json.dumps(HEAVY_MODULES), *modules],
+        cwd=_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if out.returncode != 0:
+        last = out.stderr.strip().splitlines()[-1:] or ["no output"]
+        return {"ms": None, "heavy": [], "error": last[0]}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _measure(modules: list[str], repeat: int) -> dict:
+    runs = [_probe(modules) for _ in range(repeat)]
+    failed = [r for r in runs if r["ms"] is None]
+    if failed:
+        return failed[0]
+    return {"ms": statistics.median(r["ms"] for r in runs), "heavy": runs[-1]["heavy"]}
+
+
+def _row(label: str, result: dict) -> str:
+    if result.get("error"):
+        return f"{label:<44} error: {result['error']}"
+    heavy = ", ".join(result["heavy"]) or "-"
+    return f"{label:<44} {result['ms']:8.1f} ms   heavy: {heavy}"
+
+
+@click.command()
+@click.option("--repeat", type=int, default=3, show_default=True, help="Fresh interpreters per row; the median is shown.")
+@click.option("--per-module/--no-per-module", default=True, show_default=True, help="Also time each tool module on its own.")
+def main(repeat, per_module):
+    modules = _tool_modules()
+    if per_module:
+        for module in modules:
+            click.echo(_row(module, _measure([module], repeat)))
+        click.echo()
+    click.echo(_row(f"all {len(modules)} tool modules (--load-tools)", _measure(modules, repeat)))
+    click.echo(_row("heavy dependencies alone (first execute)", _measure(list(HEAVY_MODULES), repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+./__inenv python explorations/moltbook_client.py "$@"
\ No newline at end of file
@@ -0,0 +1 @@
+./__inenv python explorations/moltbook_daemon.py "$@"
\ No newline at end of file
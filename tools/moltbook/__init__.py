@@ -1 +1,14 @@
 TOOL_NAMESPACE = "moltbook"
+
+# `slbp ui run --load-tools` imports every module in this package at startup
+# just to register its DEFINITION, while a session may only ever call one or
+# two tools. Module level therefore stays light: the standard library,
+# src.utils.log, and the state-only helpers (validation, local_state,
+# interactions, post_index, submolt_directory, profiles, upload). httpx,
+# src.data, StreamingLLM, KVManager, helpers.api and helpers.mutation_loop
+# are imported inside execute() (or the function that needs them), so they
+# load on first use. explorations/tool_import_benchmark.py checks this.
+#
+# Hosts that can read a manifest need not import tool modules at all:
+# helpers/manifest.py lists every tool's DEFINITION and approval hook,
+# parsed from source and cached in tool_manifest.json by file mtime.
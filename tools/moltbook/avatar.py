@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-import mimetypes
-import os
-
-import httpx
-
-from src.utils.http.helpers import (
-    apply_service_tokens_to_headers,
-    load_latest_service_tokens_from_db,
-)
 from src.utils.log import log
+from tools.moltbook.helpers import profiles, response_cache
+from tools.moltbook.helpers.image_optimize import fit_image
+from tools.moltbook.helpers.upload import (
+    file_sha256,
+    last_upload_hash,
+    record_upload,
+    upload_image,
+)
+from tools.moltbook.helpers.validation import validate_args
 
 DEFINITION: dict = {
     "type": "function",
@@ -17,7 +17,9 @@ DEFINITION: dict = {
         "name": "avatar",
         "description": (
             "Upload or remove your Moltbook avatar. "
-            "Supported upload formats: JPEG, PNG, GIF, WebP. Max size: 1 MB."
+            "Supported upload formats: JPEG, PNG, GIF, WebP. Max size: 1 MB — "
+            "larger or other-format images are re-encoded and downscaled to fit "
+            "automatically."
         ),
         "parameters": {
             "type": "object",
@@ -34,6 +36,13 @@ DEFINITION: dict = {
                         "Required when action is 'upload'."
                     ),
                 },
+                "force": {
+                    "type": "boolean",
+                    "description": (
+                        "Upload even if this exact image was already uploaded as your "
+                        "avatar. Defaults to false (identical re-uploads are skipped)."
+                    ),
+                },
             },
             "required": ["action"],
             "additionalProperties": False,
@@ -43,7 +52,7 @@ DEFINITION: dict = {
 
 _BASE_URL = "https://www.moltbook.com/api/v1"
 _MAX_BYTES = 1 * 1024 * 1024  # 1 MB
-_ALLOWED_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+_UPLOAD_TARGET = "agent:avatar"
 
 
 def needs_approval(args: dict) -> bool:
@@ -55,14 +64,37 @@ def execute(args: dict, session_data: dict) -> str:
 
     log("Executing avatar tool...")
 
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from src.utils.http.helpers import (
+        apply_service_tokens_to_headers,
+        load_latest_service_tokens_from_db,
+    )
+
     action: str = args["action"]
     filepath: str | None = args.get("filepath")
+    force: bool = bool(args.get("force", False))
 
     if action == "upload" and not filepath:
         return "avatar: 'filepath' is required when action is 'upload'."
     if action == "remove" and filepath is not None:
         return "avatar: 'filepath' should not be provided when action is 'remove'."
 
+    # Skip identical re-uploads without touching the network.
+    digest: str | None = None
+    if action == "upload":
+        try:
+            digest = file_sha256(filepath)
+        except OSError as e:
+            return f"avatar: could not read file: {e}"
+        if not force and digest == last_upload_hash(_UPLOAD_TARGET):
+            return (
+                "avatar: this exact image is already your avatar — nothing uploaded. "
+                "Pass force=true to upload it again."
+            )
+
     # --- load moltbook service token ---
     try:
         tokens, missing = load_latest_service_tokens_from_db(["moltbook"])
@@ -82,51 +114,26 @@ def execute(args: dict, session_data: dict) -> str:
         base_headers["Authorization"] = f"Bearer {next(iter(tokens.values()))}"
 
     if action == "remove":
-        return _remove_avatar(base_headers)
-
-    return _upload_avatar(filepath, base_headers)
-
+        return _remove_avatar(base_headers, session_data)
 
-def _upload_avatar(filepath: str, base_headers: dict) -> str:
-    # Validate format by MIME type.
-    content_type, _ = mimetypes.guess_type(filepath)
-    if content_type not in _ALLOWED_TYPES:
-        return (
-            f"avatar: unsupported file format ({content_type!r}). "
-            "Use JPEG, PNG, GIF, or WebP."
-        )
-
-    # Validate size before reading.
-    try:
-        size = os.path.getsize(filepath)
-    except OSError as e:
-        return f"avatar: could not stat file: {e}"
-    if size > _MAX_BYTES:
-        return f"avatar: file is {size} bytes, exceeds the 1 MB limit."
-
-    # Read file.
-    try:
-        with open(filepath, "rb") as f:
-            file_bytes = f.read()
-    except OSError as e:
-        return f"avatar: could not read file: {e}"
+    return _upload_avatar(filepath, digest, base_headers, session_data)
 
-    filename = os.path.basename(filepath)
 
-    # Multipart upload — do NOT include Content-Type: application/json;
-    # httpx sets the correct multipart boundary header automatically.
-    upload_headers = {k: v for k, v in base_headers.items() if k.lower() != "content-type"}
+def _upload_avatar(filepath: str, digest: str, base_headers: dict, session_data: dict) -> str:
+    upload_path, error = fit_image("avatar", filepath, _MAX_BYTES, source_hash=digest)
+    if error:
+        return error
 
-    try:
-        resp = httpx.post(
-            f"{_BASE_URL}/agents/me/avatar",
-            files={"file": (filename, file_bytes, content_type)},
-            headers=upload_headers,
-            timeout=30,
-            follow_redirects=True,
-        )
-    except Exception as e:
-        return f"avatar: HTTP error during upload: {e}"
+    resp, error = upload_image(
+        "avatar",
+        f"{_BASE_URL}/agents/me/avatar",
+        upload_path,
+        base_headers,
+        max_bytes=_MAX_BYTES,
+        limit_label="1 MB",
+    )
+    if error:
+        return error
 
     # curl -f equivalent: treat HTTP >= 400 as an error.
     if resp.status_code >= 400:
@@ -140,10 +147,15 @@ def _upload_avatar(filepath: str, base_headers: dict) -> str:
     if not data.get("success"):
         return f"avatar: upload failed: {data}"
 
+    record_upload(_UPLOAD_TARGET, digest)
+    profiles.invalidate_own(session_data)
+    response_cache.clear()
     return f"avatar: avatar uploaded successfully (HTTP {resp.status_code})."
 
 
-def _remove_avatar(base_headers: dict) -> str:
+def _remove_avatar(base_headers: dict, session_data: dict) -> str:
+    import httpx
+
     # DELETE with Content-Type: application/json is fine for a bodyless request.
     headers = {**base_headers, "Content-Type": "application/json"}
 
@@ -169,4 +181,7 @@ def _remove_avatar(base_headers: dict) -> str:
     if not data.get("success"):
         return f"avatar: remove failed: {data}"
 
+    record_upload(_UPLOAD_TARGET, None)
+    profiles.invalidate_own(session_data)
+    response_cache.clear()
     return "avatar: avatar removed successfully."
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+
+from src.utils.log import log
+from tools.moltbook.helpers import profiles
+from tools.moltbook.helpers.validation import validate_args
+
+DEFINITION: dict = {
+    "type": "function",
+    "function": {
+        "name": "comment_threads",
+        "description": (
+            "Fetch the comments of several posts at once, rebuild each reply tree, and "
+            "return only the comments that still need a reply from you: comments by "
+            "other moltys at the end of a thread, with no reply beneath them yet. "
+            "Your own comments are never included. Reply with add_comment using "
+            "the returned comment_id as parent_id."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "post_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "minItems": 1,
+                    "description": "IDs of the posts whose comment threads to check.",
+                },
+            },
+            "required": ["post_ids"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Longest comment text returned per entry; the full thread is still one
+# get_data call away.
+_MAX_CONTENT_CHARS = 600
+
+
+class _CommentNode:
+    __slots__ = ("id", "parent", "children", "author", "content", "is_mine")
+
+    def __init__(self, comment: dict, own_name: str) -> None:
+        self.id = str(comment.get("id"))
+        self.parent: _CommentNode | None = None
+        self.children: list[_CommentNode] = []
+        author = comment.get("author")
+        if isinstance(author, dict):
+            author = author.get("name")
+        self.author = author or comment.get("author_name")
+        self.content = comment.get("content") or ""
+        self.is_mine = self.author == own_name
+
+
+def _comment_list(data: object) -> list:
+    if isinstance(data, dict):
+        data = data.get("comments", data.get("data", []))
+    return data if isinstance(data, list) else []
+
+
+def build_tree(comments: list, own_name: str) -> list[_CommentNode]:
+    """Build reply trees from either nested ``replies`` or flat ``parent_id`` data.
+
+    Returns every node; roots have ``parent`` None. *own_name* must be our
+    resolved username, or every comment would count as someone else's.
+    """
+    if not own_name:
+        raise ValueError("build_tree needs our own username")
+    nodes: dict[str, _CommentNode] = {}
+    parent_ids: dict[str, str] = {}
+    queue: deque[tuple[dict, str | None]] = deque(
+        (c, None) for c in comments if isinstance(c, dict)
+    )
+    while queue:
+        comment, nested_parent = queue.popleft()
+        node = _CommentNode(comment, own_name)
+        nodes[node.id] = node
+        parent_id = nested_parent or comment.get("parent_id")
+        if parent_id is not None:
+            parent_ids[node.id] = str(parent_id)
+        for reply in comment.get("replies") or ():
+            if isinstance(reply, dict):
+                queue.append((reply, node.id))
+
+    for child_id, parent_id in parent_ids.items():
+        parent = nodes.get(parent_id)
+        if parent is not None:
+            child = nodes[child_id]
+            child.parent = parent
+            parent.children.append(child)
+    return list(nodes.values())
+
+
+def _depth(node: _CommentNode) -> int:
+    depth = 0
+    while node.parent is not None:
+        node = node.parent
+        depth += 1
+    return depth
+
+
+def needs_reply(nodes: list[_CommentNode]) -> list[_CommentNode]:
+    """Leaf comments by others: the last word in a thread is not ours."""
+    return [node for node in nodes if not node.children and not node.is_mine]
+
+
+def execute(args: dict, session_data: dict) -> str:
+
+    log("Executing comment_threads tool...")
+
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from tools.moltbook.helpers.api import fetch_many, load_auth_headers, shared_client
+
+    post_ids: list[str] = [str(p) for p in args["post_ids"]]
+
+    headers, error = load_auth_headers("comment_threads")
+    if error:
+        return error
+
+    paths = {post_id: f"/posts/{post_id}/comments?sort=new" for post_id in post_ids}
+    client = shared_client()
+    identity, error = profiles.own_identity(session_data, headers, client)
+    if error:
+        return f"comment_threads: could not determine your username: {error}"
+    results = fetch_many(client, list(paths.values()), headers, use_cache=True)
+    own_name = identity["name"]
+
+    posts_out: list[dict] = []
+    for post_id, path in paths.items():
+        result = results[path]
+        if result["error"]:
+            posts_out.append({"post_id": post_id, "error": result["error"]})
+            continue
+        nodes = build_tree(_comment_list(result["data"]), own_name)
+        pending = needs_reply(nodes)
+        posts_out.append({
+            "post_id": post_id,
+            "total_comments": len(nodes),
+            "needs_reply": [
+                {
+                    "comment_id": node.id,
+                    "author": node.author,
+                    "content": node.content[:_MAX_CONTENT_CHARS],
+                    "parent_id": node.parent.id if node.parent else None,
+                    "depth": _depth(node),
+                }
+                for node in pending
+            ],
+        })
+
+    return json.dumps({"you": own_name, "posts": posts_out}, indent=2)
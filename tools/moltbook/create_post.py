@@ -1,15 +1,10 @@
 from __future__ import annotations
 
-from src.data import get_pool
-from src.tools._memory import ensure_session_memory
-from src.utils.http.helpers import (
-    apply_service_tokens_to_headers,
-    load_latest_service_tokens_from_db,
-)
-from src.utils.llm.streaming import StreamingLLM
-from src.utils.sql.kv_manager import KVManager
+import json
+
 from src.utils.log import log
-from tools.moltbook.helpers.mutation_loop import run_mutation_loop
+from tools.moltbook.helpers import post_index
+from tools.moltbook.helpers.validation import validate_args
 
 LEAVE_OUT = "KEEP"
 
@@ -31,6 +26,7 @@ DEFINITION: dict = {
                 },
                 "title": {
                     "type": "string",
+                    "minLength": 1,
                     "description": "Title of the post.",
                 },
                 "content": {
@@ -55,6 +51,14 @@ DEFINITION: dict = {
                         "session_memory_key — do not provide either when using this."
                     ),
                 },
+                "check_duplicates": {
+                    "type": "boolean",
+                    "description": (
+                        "Before posting, compare the title and body against posts you "
+                        "have already read or written and refuse near-duplicates. "
+                        "Defaults to true; set to false to post anyway."
+                    ),
+                },
             },
             "required": ["submolt_name", "title"],
             "additionalProperties": False,
@@ -65,43 +69,22 @@ DEFINITION: dict = {
 
 _BASE_URL = "https://www.moltbook.com/api/v1"
 
-
-def _load_llm_config() -> dict | None:
-    """Load just the fields needed to instantiate StreamingLLM."""
-    try:
-        pool = get_pool()
-    except Exception:
-        return None
-    with pool.get_connection() as conn:
-        kv = KVManager(conn)
-        active_token = kv.get_value("active_token")
-        if not active_token:
-            return None
-        provider = active_token["provider"]
-        token_name = active_token.get("name", "")
-        with conn.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT token_value, endpoint_url
-                FROM tokens
-                WHERE BINARY provider = BINARY %s
-                  AND BINARY token_name = BINARY %s
-                LIMIT 1
-                """,
-                (provider, token_name),
-            )
-            row = cursor.fetchone()
-        if not row:
-            return None
-        token_value, endpoint_url = row
-        model = kv.get_value("model") or None
-    return {"endpoint_url": endpoint_url, "token_value": token_value, "model": model}
+# Most near-duplicates listed when a post is refused.
+_MAX_DUPLICATES_SHOWN = 5
 
 
 def execute(args: dict, session_data: dict) -> str:
 
     log("Executing create_post tool...")
 
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from src.tools._memory import ensure_session_memory
+    from tools.moltbook.helpers.api import flush_observers, load_auth_headers
+    from tools.moltbook.helpers.mutation_loop import run_mutation_loop, verification_llm
+
     submolt_name: str = args["submolt_name"]
     title: str = args["title"]
 
@@ -142,37 +125,31 @@ def execute(args: dict, session_data: dict) -> str:
 
         post_data = {"submolt_name": submolt_name, "title": title, "content": content}
 
-    # --- load moltbook service token ---
-    try:
-        tokens, missing = load_latest_service_tokens_from_db(["moltbook"])
-        log(repr(tokens))
-        log(repr(missing))
-    except Exception as e:
-        return f"create_post: failed to load moltbook service token: {e}"
-    if missing:
-        return (
-            "create_post: no service token found for 'moltbook'. "
-            "Create one with: slbp service-token set moltbook <token>"
-        )
-
-    base_headers = {"Content-Type": "application/json", "Accept": "application/json"}
-    base_headers = apply_service_tokens_to_headers(base_headers, tokens)
-    if not any(k.lower() == "authorization" for k in base_headers):
-        base_headers["Authorization"] = f"Bearer {next(iter(tokens.values()))}"
-
-    # --- load LLM config ---
-    llm_config = _load_llm_config()
-    if not llm_config:
-        return (
-            "create_post: could not load LLM configuration from the database. "
-            "Make sure an active token and endpoint are configured."
-        )
-    llm = StreamingLLM(
-        endpoint=llm_config["endpoint_url"],
-        token=llm_config["token_value"],
-        model=llm_config["model"],
-        timeout_s=30,
-    )
+    # --- local near-duplicate check (posting is limited to 1 per 30 minutes) ---
+    body = post_data.get("content") or post_data.get("url") or ""
+    if args.get("check_duplicates", True):
+        flush_observers()
+        duplicates = post_index.find_near_duplicates(title, body)
+        if duplicates:
+            return (
+                "create_post: this looks like a near-duplicate of posts you have already "
+                "read or written; not posting. Set 'check_duplicates' to false to post "
+                f"anyway.\n{json.dumps(duplicates[:_MAX_DUPLICATES_SHOWN], indent=2)}"
+            )
+
+    base_headers, error = load_auth_headers("create_post")
+    if error:
+        return error
+
+    llm, error = verification_llm("create_post")
+    if error:
+        return error
+
+    def _record_own_post(response: dict) -> None:
+        post = response.get("post")
+        post_id = (post.get("id") if isinstance(post, dict) else None) or response.get("content_id")
+        if post_id is not None:
+            post_index.record_own_post(str(post_id), title, body, submolt_name)
 
     return run_mutation_loop(
         endpoint="/posts",
@@ -181,4 +158,5 @@ def execute(args: dict, session_data: dict) -> str:
         base_headers=base_headers,
         base_url=_BASE_URL,
         data=post_data,
+        on_success=_record_own_post,
     )
@@ -1,14 +1,8 @@
 from __future__ import annotations
 
-from src.data import get_pool
-from src.utils.http.helpers import (
-    apply_service_tokens_to_headers,
-    load_latest_service_tokens_from_db,
-)
-from src.utils.llm.streaming import StreamingLLM
-from src.utils.sql.kv_manager import KVManager
 from src.utils.log import log
-from tools.moltbook.helpers.mutation_loop import run_mutation_loop
+from tools.moltbook.helpers import submolt_directory
+from tools.moltbook.helpers.validation import validate_args
 
 DEFINITION: dict = {
     "type": "function",
@@ -24,6 +18,9 @@ DEFINITION: dict = {
             "properties": {
                 "name": {
                     "type": "string",
+                    "minLength": 2,
+                    "maxLength": 30,
+                    "pattern": "^[a-z0-9-]+$",
                     "description": (
                         "URL-safe name for the submolt: lowercase letters, digits, "
                         "and hyphens only, 2-30 characters."
@@ -56,42 +53,21 @@ DEFINITION: dict = {
 _BASE_URL = "https://www.moltbook.com/api/v1"
 
 
-def _load_llm_config() -> dict | None:
-    """Load just the fields needed to instantiate StreamingLLM."""
-    try:
-        pool = get_pool()
-    except Exception:
-        return None
-    with pool.get_connection() as conn:
-        kv = KVManager(conn)
-        active_token = kv.get_value("active_token")
-        if not active_token:
-            return None
-        provider = active_token["provider"]
-        token_name = active_token.get("name", "")
-        with conn.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT token_value, endpoint_url
-                FROM tokens
-                WHERE BINARY provider = BINARY %s
-                  AND BINARY token_name = BINARY %s
-                LIMIT 1
-                """,
-                (provider, token_name),
-            )
-            row = cursor.fetchone()
-        if not row:
-            return None
-        token_value, endpoint_url = row
-        model = kv.get_value("model") or None
-    return {"endpoint_url": endpoint_url, "token_value": token_value, "model": model}
-
-
 def execute(args: dict, session_data: dict) -> str:
 
     log("Executing create_submolt tool...")
 
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from tools.moltbook.helpers.api import load_auth_headers
+    from tools.moltbook.helpers.mutation_loop import (
+        mutation_succeeded,
+        run_mutation_loop,
+        verification_llm,
+    )
+
     submolt_data: dict = {
         "name": args["name"],
         "display_name": args["display_name"],
@@ -101,39 +77,15 @@ def execute(args: dict, session_data: dict) -> str:
     if "allow_crypto" in args:
         submolt_data["allow_crypto"] = args["allow_crypto"]
 
-    # --- load moltbook service token ---
-    try:
-        tokens, missing = load_latest_service_tokens_from_db(["moltbook"])
-        log(repr(tokens))
-        log(repr(missing))
-    except Exception as e:
-        return f"create_submolt: failed to load moltbook service token: {e}"
-    if missing:
-        return (
-            "create_submolt: no service token found for 'moltbook'. "
-            "Create one with: slbp service-token set moltbook <token>"
-        )
+    base_headers, error = load_auth_headers("create_submolt")
+    if error:
+        return error
 
-    base_headers = {"Content-Type": "application/json", "Accept": "application/json"}
-    base_headers = apply_service_tokens_to_headers(base_headers, tokens)
-    if not any(k.lower() == "authorization" for k in base_headers):
-        base_headers["Authorization"] = f"Bearer {next(iter(tokens.values()))}"
+    llm, error = verification_llm("create_submolt")
+    if error:
+        return error
 
-    # --- load LLM config ---
-    llm_config = _load_llm_config()
-    if not llm_config:
-        return (
-            "create_submolt: could not load LLM configuration from the database. "
-            "Make sure an active token and endpoint are configured."
-        )
-    llm = StreamingLLM(
-        endpoint=llm_config["endpoint_url"],
-        token=llm_config["token_value"],
-        model=llm_config["model"],
-        timeout_s=30,
-    )
-
-    return run_mutation_loop(
+    result = run_mutation_loop(
         endpoint="/submolts",
         method="POST",
         llm=llm,
@@ -141,3 +93,8 @@ def execute(args: dict, session_data: dict) -> str:
         base_url=_BASE_URL,
         data=submolt_data,
     )
+    if mutation_succeeded(result):
+        submolt_directory.record_created(
+            submolt_data["name"], submolt_data["display_name"], submolt_data.get("description")
+        )
+    return result
@@ -1,14 +1,7 @@
 from __future__ import annotations
 
-from src.data import get_pool
-from src.utils.http.helpers import (
-    apply_service_tokens_to_headers,
-    load_latest_service_tokens_from_db,
-)
-from src.utils.llm.streaming import StreamingLLM
-from src.utils.sql.kv_manager import KVManager
 from src.utils.log import log
-from tools.moltbook.helpers.mutation_loop import run_mutation_loop
+from tools.moltbook.helpers.validation import validate_args
 
 DEFINITION: dict = {
     "type": "function",
@@ -37,75 +30,26 @@ DEFINITION: dict = {
 _BASE_URL = "https://www.moltbook.com/api/v1"
 
 
-def _load_llm_config() -> dict | None:
-    """Load just the fields needed to instantiate StreamingLLM."""
-    try:
-        pool = get_pool()
-    except Exception:
-        return None
-    with pool.get_connection() as conn:
-        kv = KVManager(conn)
-        active_token = kv.get_value("active_token")
-        if not active_token:
-            return None
-        provider = active_token["provider"]
-        token_name = active_token.get("name", "")
-        with conn.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT token_value, endpoint_url
-                FROM tokens
-                WHERE BINARY provider = BINARY %s
-                  AND BINARY token_name = BINARY %s
-                LIMIT 1
-                """,
-                (provider, token_name),
-            )
-            row = cursor.fetchone()
-        if not row:
-            return None
-        token_value, endpoint_url = row
-        model = kv.get_value("model") or None
-    return {"endpoint_url": endpoint_url, "token_value": token_value, "model": model}
-
-
 def execute(args: dict, session_data: dict) -> str:
 
     log("Executing delete_post tool...")
 
-    post_id: str = args["post_id"]
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
 
-    # --- load moltbook service token ---
-    try:
-        tokens, missing = load_latest_service_tokens_from_db(["moltbook"])
-        log(repr(tokens))
-        log(repr(missing))
-    except Exception as e:
-        return f"delete_post: failed to load moltbook service token: {e}"
-    if missing:
-        return (
-            "delete_post: no service token found for 'moltbook'. "
-            "Create one with: slbp service-token set moltbook <token>"
-        )
+    from tools.moltbook.helpers.api import load_auth_headers
+    from tools.moltbook.helpers.mutation_loop import run_mutation_loop, verification_llm
 
-    base_headers = {"Content-Type": "application/json", "Accept": "application/json"}
-    base_headers = apply_service_tokens_to_headers(base_headers, tokens)
-    if not any(k.lower() == "authorization" for k in base_headers):
-        base_headers["Authorization"] = f"Bearer {next(iter(tokens.values()))}"
+    post_id: str = args["post_id"]
 
-    # --- load LLM config ---
-    llm_config = _load_llm_config()
-    if not llm_config:
-        return (
-            "delete_post: could not load LLM configuration from the database. "
-            "Make sure an active token and endpoint are configured."
-        )
-    llm = StreamingLLM(
-        endpoint=llm_config["endpoint_url"],
-        token=llm_config["token_value"],
-        model=llm_config["model"],
-        timeout_s=30,
-    )
+    base_headers, error = load_auth_headers("delete_post")
+    if error:
+        return error
+
+    llm, error = verification_llm("delete_post")
+    if error:
+        return error
 
     return run_mutation_loop(
         endpoint=f"/posts/{post_id}",
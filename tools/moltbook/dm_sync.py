@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+
+from src.utils.log import log
+from tools.moltbook.helpers import profiles, response_cache
+from tools.moltbook.helpers.local_state import load_state, save_state
+from tools.moltbook.helpers.validation import validate_args
+
+DEFINITION: dict = {
+    "type": "function",
+    "function": {
+        "name": "dm_sync",
+        "description": (
+            "Check all DM activity in one call: pending chat requests plus only the "
+            "NEW messages in each conversation since the last sync. Conversations "
+            "with nothing new are not re-read (reading marks messages as read), and "
+            "messages you sent yourself are left out. "
+            "Items that must be escalated to your human (new requests, messages "
+            "with needs_human_input) are listed under 'escalate'."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "reset_cursor": {
+                    "type": "boolean",
+                    "description": (
+                        "Forget what was seen before and return every message in "
+                        "every conversation. Defaults to false."
+                    ),
+                },
+            },
+            "required": [],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Local record of the last message seen per conversation.
+_CURSOR_STATE = "dm_cursor"
+
+
+def _items(data: object, key: str) -> list:
+    """The list under *key* (or *data* itself if it is already a list)."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        value = data.get(key)
+        if isinstance(value, list):
+            return value
+        if isinstance(data.get("data"), (dict, list)):
+            return _items(data["data"], key)
+    return []
+
+
+def _conversation_id(conv: dict) -> str | None:
+    value = conv.get("conversation_id") or conv.get("id")
+    return str(value) if value is not None else None
+
+
+def _name(value: object) -> str | None:
+    if isinstance(value, dict):
+        return value.get("name") or value.get("username")
+    return value if isinstance(value, str) else None
+
+
+def _counterpart(conv: dict) -> str | None:
+    for key in ("with_agent", "other_agent", "agent", "with"):
+        name = _name(conv.get(key))
+        if name:
+            return name
+    return None
+
+
+def _latest_marker(conv: dict) -> str | None:
+    """Something that changes whenever a conversation gets a new message."""
+    last = conv.get("last_message")
+    if isinstance(last, dict) and last.get("id") is not None:
+        return str(last["id"])
+    for key in ("last_message_id", "last_message_at", "updated_at"):
+        if conv.get(key) is not None:
+            return str(conv[key])
+    return None
+
+
+def _compact_message(msg: dict) -> dict:
+    return {
+        "id": msg.get("id"),
+        "from": _name(msg.get("sender")) or _name(msg.get("from")) or msg.get("sender_name"),
+        "message": msg.get("message") if msg.get("message") is not None else msg.get("content"),
+        "needs_human_input": bool(msg.get("needs_human_input")),
+        "created_at": msg.get("created_at"),
+    }
+
+
+def _new_messages(messages: list, last_seen_id: str | None) -> list[dict]:
+    """Messages after *last_seen_id*, oldest first."""
+    messages = [m for m in messages if isinstance(m, dict)]
+    if all(m.get("created_at") for m in messages):
+        messages.sort(key=lambda m: str(m["created_at"]))
+    if last_seen_id is not None:
+        for index, msg in enumerate(messages):
+            if str(msg.get("id")) == last_seen_id:
+                return messages[index + 1:]
+    return messages
+
+
+def execute(args: dict, session_data: dict) -> str:
+
+    log("Executing dm_sync tool...")
+
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from tools.moltbook.helpers.api import fetch_many, load_auth_headers, shared_client
+
+    reset_cursor: bool = bool(args.get("reset_cursor", False))
+
+    headers, error = load_auth_headers("dm_sync")
+    if error:
+        return error
+
+    cursor: dict = {} if reset_cursor else load_state(_CURSOR_STATE)
+
+    client = shared_client()
+    identity, error = profiles.own_identity(session_data, headers, client)
+    if error:
+        return f"dm_sync: could not determine your username: {error}"
+    own_name = identity["name"]
+
+    overview = fetch_many(
+        client,
+        ["/agents/dm/check", "/agents/dm/requests", "/agents/dm/conversations"],
+        headers,
+    )
+    for path, result in overview.items():
+        if result["error"]:
+            return f"dm_sync: {result['error']}: {json.dumps(result['data'])[:400]}"
+
+    conversations = [
+        c for c in _items(overview["/agents/dm/conversations"]["data"], "conversations")
+        if isinstance(c, dict) and _conversation_id(c)
+    ]
+
+    # Only re-read threads that report unread messages or whose latest
+    # message changed since the last sync.
+    to_read: dict[str, dict] = {}
+    unchanged = 0
+    for conv in conversations:
+        conv_id = _conversation_id(conv)
+        seen = cursor.get(conv_id, {})
+        marker = _latest_marker(conv)
+        unread = conv.get("unread_count") or 0
+        if unread or not seen or marker is None or marker != seen.get("marker"):
+            to_read[f"/agents/dm/conversations/{conv_id}"] = conv
+        else:
+            unchanged += 1
+
+    threads = fetch_many(client, list(to_read), headers)
+    if threads:
+        # Reading a thread marks it read, so cached DM overviews are now stale.
+        response_cache.invalidate("/agents/dm/", prefix=True)
+
+    escalate: list[dict] = []
+    requests_out: list[dict] = []
+    for req in _items(overview["/agents/dm/requests"]["data"], "requests"):
+        if not isinstance(req, dict):
+            continue
+        entry = {
+            "conversation_id": _conversation_id(req),
+            "from": _counterpart(req) or _name(req.get("from")),
+            "message": req.get("message"),
+        }
+        requests_out.append(entry)
+        escalate.append({"reason": "new chat request", **entry})
+
+    conversations_out: list[dict] = []
+    errors: list[str] = []
+    for path, result in threads.items():
+        conv = to_read[path]
+        conv_id = _conversation_id(conv)
+        if result["error"]:
+            errors.append(f"{conv_id}: {result['error']}")
+            continue
+        messages = _items(result["data"], "messages")
+        if not messages and isinstance(result["data"], dict):
+            messages = _items(result["data"].get("conversation"), "messages")
+        fresh = _new_messages(messages, cursor.get(conv_id, {}).get("last_message_id"))
+        # Our own messages still move the cursor but are not reported.
+        compact = [
+            msg for msg in (_compact_message(m) for m in fresh) if msg["from"] != own_name
+        ]
+
+        if messages:
+            latest = _new_messages(messages, None)[-1]
+            cursor[conv_id] = {
+                "last_message_id": str(latest.get("id")),
+                "marker": _latest_marker(conv),
+            }
+        if not compact:
+            unchanged += 1
+            continue
+
+        conversations_out.append({
+            "conversation_id": conv_id,
+            "with": _counterpart(conv),
+            "new_messages": compact,
+        })
+        for msg in compact:
+            if msg["needs_human_input"]:
+                escalate.append({
+                    "reason": "needs_human_input",
+                    "conversation_id": conv_id,
+                    **msg,
+                })
+
+    save_state(_CURSOR_STATE, cursor)
+
+    check = overview["/agents/dm/check"]["data"]
+    result: dict = {
+        "has_activity": check.get("has_activity") if isinstance(check, dict) else None,
+        "pending_requests": requests_out,
+        "conversations_with_new_messages": conversations_out,
+        "unchanged_conversations": unchanged,
+        "escalate": escalate,
+    }
+    if errors:
+        result["errors"] = errors
+    return json.dumps(result, indent=2)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+
+from src.utils.log import log
+from tools.moltbook.helpers import interactions, profiles
+from tools.moltbook.helpers.validation import validate_args
+
+DEFINITION: dict = {
+    "type": "function",
+    "function": {
+        "name": "follow_candidates",
+        "description": (
+            "Rank moltys you are not following yet by how much you have engaged with "
+            "their content (upvotes and comments, weighted toward recent ones, "
+            "downvotes counting against). Built from a local record of your votes, "
+            "comments and follows — no API calls beyond your own (cached) profile "
+            "unless profiles are requested. Use it to decide whom to follow. Follows "
+            "made elsewhere are only known once their posts show up in your "
+            "following feed or an upvote reports them, so a molty you already "
+            "follow may still be listed."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "min_interactions": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": (
+                        "Fewest upvotes + comments on someone's content to count them "
+                        "as a candidate. Defaults to 3."
+                    ),
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 50,
+                    "description": "Most candidates to return. Defaults to 10.",
+                },
+                "with_profiles": {
+                    "type": "boolean",
+                    "description": (
+                        "Also include a short profile of each candidate (cached, so "
+                        "repeat calls are cheap). Defaults to false."
+                    ),
+                },
+            },
+            "required": [],
+            "additionalProperties": False,
+        },
+    },
+}
+
+_DEFAULT_MIN_INTERACTIONS = 3
+_DEFAULT_LIMIT = 10
+
+# Profile fields worth showing next to a candidate.
+_PROFILE_FIELDS = ("description", "karma", "follower_count", "following_count", "last_active")
+
+
+def execute(args: dict, session_data: dict) -> str:
+
+    log("Executing follow_candidates tool...")
+
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from tools.moltbook.helpers.api import load_auth_headers, shared_client
+
+    min_interactions = int(args.get("min_interactions", _DEFAULT_MIN_INTERACTIONS))
+    limit = int(args.get("limit", _DEFAULT_LIMIT))
+
+    headers, error = load_auth_headers("follow_candidates")
+    if error:
+        return error
+    client = shared_client()
+    # /agents/me is cached for hours, so this rarely costs a request.
+    identity, error = profiles.own_identity(session_data, headers, client)
+    if error:
+        return f"follow_candidates: could not determine your username: {error}"
+
+    candidates = interactions.follow_candidates(
+        min_interactions, limit, exclude=[identity["name"]]
+    )
+    out: dict = {"following": interactions.following(), "candidates": candidates}
+    if not candidates:
+        out["note"] = (
+            f"no molty has {min_interactions}+ upvotes/comments from you yet; "
+            "lower 'min_interactions' or engage more first."
+        )
+        return json.dumps(out, indent=2)
+
+    if args.get("with_profiles"):
+        results = profiles.get_profiles(client, headers, [c["name"] for c in candidates])
+        for candidate in candidates:
+            result = results[candidate["name"]]
+            if result["error"]:
+                candidate["profile_error"] = result["error"]
+            else:
+                candidate["profile"] = profiles.profile_summary(result, _PROFILE_FIELDS)
+
+    return json.dumps(out, indent=2)
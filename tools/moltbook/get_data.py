@@ -1,15 +1,8 @@
 from __future__ import annotations
 import json
 
-import httpx
-
-from src.utils.http.helpers import (
-    apply_service_tokens_to_headers,
-    format_response,
-    is_json_content_type,
-    load_latest_service_tokens_from_db,
-)
 from src.utils.log import log
+from tools.moltbook.helpers.validation import validate_args
 
 DEFINITION: dict = {
     "type": "function",
@@ -43,6 +36,13 @@ DEFINITION: dict = {
                         "Required when target is 'session_memory'."
                     ),
                 },
+                "bypass_cache": {
+                    "type": "boolean",
+                    "description": (
+                        "Always fetch from the network, even if a recently fetched "
+                        "or prefetched response is available. Defaults to false."
+                    ),
+                },
             },
             "required": ["path"],
             "additionalProperties": False,
@@ -50,70 +50,49 @@ DEFINITION: dict = {
     },
 }
 
-_BASE_URL = "https://www.moltbook.com/api/v1"
-
 
 def execute(args: dict, session_data: dict) -> str:
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from src.utils.http.helpers import format_response
+    from tools.moltbook.helpers.api import get_json, load_auth_headers, shared_client
+
     path: str = args["path"]
     target: str = args.get("target", "return_value")
     session_memory_key: str | None = args.get("session_memory_key")
+    bypass_cache: bool = bool(args.get("bypass_cache", False))
 
     if target == "session_memory" and not session_memory_key:
         return "get_data: 'session_memory_key' is required when target is 'session_memory'."
 
     log(f"Executing get_data tool: GET {path}")
 
-    # Build full URL — normalize slashes.
-    url = _BASE_URL.rstrip("/") + "/" + path.lstrip("/")
-
-    # Load moltbook service token.
-    try:
-        tokens, missing = load_latest_service_tokens_from_db(["moltbook"])
-    except Exception as e:
-        return f"get_data: failed to load moltbook service token: {e}"
-    if missing:
-        return (
-            "get_data: no service token found for 'moltbook'. "
-            "Create one with: slbp service-token set moltbook <token>"
-        )
+    # Load moltbook service token and build headers.
+    headers, error = load_auth_headers("get_data")
+    if error:
+        return error
 
-    # Build headers.
-    headers: dict[str, str] = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    }
-    headers = apply_service_tokens_to_headers(headers, tokens)
-    if not any(k.lower() == "authorization" for k in headers):
-        headers["Authorization"] = f"Bearer {next(iter(tokens.values()))}"
+    # Make request (or serve a fresh cached / prefetched response). Concurrent
+    # identical GETs from other tools share one request on the pooled client.
+    result = get_json(shared_client(), path, headers, use_cache=not bypass_cache)
+    if result["status"] == 0:
+        return f"get_data: {result['error']}"
 
-    # Make request.
-    try:
-        resp = httpx.Client(follow_redirects=True, timeout=20).get(url, headers=headers)
-    except Exception as e:
-        return f"get_data: HTTP error during GET {path}: {e}"
-
-    resp_ct = resp.headers.get("content-type")
+    json_value = result["data"]
     accept = "application/json"
 
-    # Parse JSON response.
-    json_value = None
-    json_error = None
-    if is_json_content_type(resp_ct):
-        try:
-            json_value = resp.json()
-        except Exception as e:
-            json_error = f"Failed to parse JSON: {e}"
-
     if target == "session_memory":
         memory = session_data.setdefault("memory", {})
-        memory[session_memory_key] = json.dumps(json_value,indent=2) if json_value is not None else resp.text
+        memory[session_memory_key] = json.dumps(json_value,indent=2) if json_value is not None else result["text"]
         return f"get_data: response saved to session memory key {session_memory_key!r}."
 
     return format_response(
-        status_code=resp.status_code,
-        response_content_type=resp_ct,
+        status_code=result["status"],
+        response_content_type=result["content_type"],
         accept=accept,
         json_value=json_value,
-        text_value=resp.text if json_value is None else None,
-        json_error=json_error,
+        text_value=result["text"] if json_value is None else None,
+        json_error=result["json_error"],
     )
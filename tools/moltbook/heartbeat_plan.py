@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+
+from src.utils.log import log
+from tools.moltbook.helpers.validation import validate_args
+
+DEFINITION: dict = {
+    "type": "function",
+    "function": {
+        "name": "heartbeat_plan",
+        "description": (
+            "Start a heartbeat with one call: fetches /home, the DM check and the "
+            "following feed concurrently and returns a ranked, de-duplicated action "
+            "list (posts with comments to answer, DMs to handle, posts worth "
+            "upvoting, and the server's own suggestions), each with the tool call to "
+            "make. Use it instead of building the todo list by hand."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "max_upvote_candidates": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "description": "Most feed posts to suggest for upvoting. Defaults to 10.",
+                },
+            },
+            "required": [],
+            "additionalProperties": False,
+        },
+    },
+}
+
+_DEFAULT_MAX_UPVOTE_CANDIDATES = 10
+
+# Keys under which a post reports that we already voted on it.
+_VOTED_KEYS = ("user_vote", "your_vote", "my_vote", "has_upvoted", "upvoted")
+
+
+def _as_list(value: object, *keys: str) -> list:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        for key in keys:
+            if isinstance(value.get(key), list):
+                return value[key]
+    return []
+
+
+def _post_id(item: dict) -> str | None:
+    post = item.get("post") if isinstance(item.get("post"), dict) else {}
+    value = item.get("post_id") or item.get("id") or post.get("id")
+    return str(value) if value is not None else None
+
+
+def _author(item: dict) -> str | None:
+    author = item.get("author")
+    if isinstance(author, dict):
+        return author.get("name")
+    return author or item.get("author_name")
+
+
+def _int(value: object) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _dm_counts(home_dms: object, dm_check: object) -> tuple[int, int]:
+    """(pending requests, unread messages) from /agents/dm/check, else /home."""
+    for source in (dm_check, home_dms):
+        if not isinstance(source, dict):
+            continue
+        pending = source.get("pending_request_count", source.get("pending_requests"))
+        unread = source.get("unread_message_count", source.get("unread_messages"))
+        if isinstance(pending, list):
+            pending = len(pending)
+        if isinstance(unread, list):
+            unread = len(unread)
+        if pending is not None or unread is not None:
+            return _int(pending), _int(unread)
+    return 0, 0
+
+
+def build_plan(home: dict, dm_check: object, feed: object, max_upvote_candidates: int) -> dict:
+    """Turn the three heartbeat responses into a ranked action list."""
+    account = home.get("your_account") if isinstance(home.get("your_account"), dict) else {}
+    own_name = account.get("name")
+    actions: list[dict] = []
+
+    # 1. Activity on our posts — most new comments first.
+    activity = [
+        item for item in _as_list(home.get("activity_on_your_posts"), "posts", "items")
+        if isinstance(item, dict) and _post_id(item)
+    ]
+    activity.sort(
+        key=lambda item: _int(item.get("new_comment_count") or item.get("new_comments")
+                              or item.get("count")),
+        reverse=True,
+    )
+    own_post_ids = {_post_id(item) for item in activity}
+    if activity:
+        actions.append({
+            "action": "reply_to_comments_on_your_posts",
+            "posts": [
+                {
+                    "post_id": _post_id(item),
+                    "title": item.get("title") or item.get("post_title"),
+                    "new_comments": _int(item.get("new_comment_count")
+                                         or item.get("new_comments") or item.get("count")),
+                }
+                for item in activity
+            ],
+            "tool": "comment_threads",
+            "args": {"post_ids": [_post_id(item) for item in activity]},
+            "then": "mark_notifications_read for each post",
+        })
+
+    # 2. Direct messages.
+    pending, unread = _dm_counts(home.get("your_direct_messages"), dm_check)
+    if pending or unread:
+        actions.append({
+            "action": "handle_direct_messages",
+            "pending_requests": pending,
+            "unread_messages": unread,
+            "tool": "dm_sync",
+            "args": {},
+            "escalate": pending > 0,
+        })
+
+    # 3. Posts worth upvoting — following feed plus /home's followed posts,
+    # de-duplicated, skipping our own and anything already voted on.
+    seen: set[str] = set(own_post_ids)
+    candidates: list[dict] = []
+    for post in (
+        *_as_list(feed, "posts", "data"),
+        *_as_list(home.get("posts_from_accounts_you_follow"), "posts"),
+    ):
+        if not isinstance(post, dict):
+            continue
+        post_id = _post_id(post)
+        if not post_id or post_id in seen:
+            continue
+        seen.add(post_id)
+        if own_name and _author(post) == own_name:
+            continue
+        if any(post.get(key) for key in _VOTED_KEYS):
+            continue
+        candidates.append({
+            "post_id": post_id,
+            "title": post.get("title"),
+            "author": _author(post),
+            "upvotes": _int(post.get("upvotes")),
+            "comments": _int(post.get("comment_count")),
+            "needs_full_fetch": "content_preview" in post,
+        })
+    if candidates:
+        actions.append({
+            "action": "read_and_upvote",
+            "posts": candidates[:max_upvote_candidates],
+            "tool": "vote",
+        })
+
+    # 4. Whatever else the server suggests, once each.
+    suggestions: list[str] = []
+    for item in _as_list(home.get("what_to_do_next"), "items", "actions"):
+        text = item if isinstance(item, str) else json.dumps(item)
+        if text not in suggestions:
+            suggestions.append(text)
+    if suggestions:
+        actions.append({"action": "server_suggestions", "items": suggestions})
+
+    for rank, action in enumerate(actions, start=1):
+        action["rank"] = rank
+
+    return {
+        "you": own_name,
+        "karma": account.get("karma"),
+        "unread_notifications": account.get("unread_notification_count"),
+        "actions": actions,
+    }
+
+
+def execute(args: dict, session_data: dict) -> str:
+
+    log("Executing heartbeat_plan tool...")
+
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from tools.moltbook.helpers import prefetch
+    from tools.moltbook.helpers.api import fetch_many, load_auth_headers, shared_client
+
+    max_upvote_candidates = _int(args.get("max_upvote_candidates", _DEFAULT_MAX_UPVOTE_CANDIDATES))
+
+    headers, error = load_auth_headers("heartbeat_plan")
+    if error:
+        return error
+
+    # A heartbeat is starting: re-anchor the prefetch schedule, and read the
+    # cache it may have warmed.
+    prefetch.mark_heartbeat()
+    client = shared_client()
+    results = fetch_many(
+        client,
+        [prefetch.HOME_PATH, prefetch.DM_CHECK_PATH, prefetch.FOLLOWING_FEED_PATH],
+        headers,
+        use_cache=True,
+    )
+
+    home = results[prefetch.HOME_PATH]
+    if home["error"] or not isinstance(home["data"], dict):
+        return f"heartbeat_plan: could not load /home: {home['error']}"
+
+    others = (results[prefetch.DM_CHECK_PATH], results[prefetch.FOLLOWING_FEED_PATH])
+    errors = [r["error"] for r in others if r["error"]]
+    plan = build_plan(
+        home["data"],
+        results[prefetch.DM_CHECK_PATH]["data"],
+        results[prefetch.FOLLOWING_FEED_PATH]["data"],
+        max_upvote_candidates,
+    )
+    if errors:
+        plan["errors"] = errors
+    return json.dumps(plan, indent=2)
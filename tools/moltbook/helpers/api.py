@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # optional: faster decoding of large listing pages
+    orjson = None
+
+from src.utils.http.helpers import (
+    apply_service_tokens_to_headers,
+    is_json_content_type,
+    load_latest_service_tokens_from_db,
+)
+from src.utils.log import log
+from tools.moltbook.helpers import interactions, post_index, response_cache, submolt_directory
+
+BASE_URL = "https://www.moltbook.com/api/v1"
+
+# Most requests one fan-out keeps in flight at once. Keeps bursts well
+# inside the 100 requests/minute API budget.
+MAX_CONCURRENCY = 8
+
+# The Moltbook API allows 100 requests per minute.
+REQUESTS_PER_MINUTE = 100
+
+# Content codings this httpx can decode, as httpx itself reports them: gzip
+# and deflate always, br / zstd only when brotli / zstandard are installed
+# and (for zstd) httpx is 0.27.1 or newer. Advertising a coding httpx cannot
+# decode would hand us compressed bytes as the body. SUPPORTED_DECODERS is
+# private to httpx, so anything unexpected falls back to gzip and deflate.
+try:
+    from httpx._decoders import SUPPORTED_DECODERS as _DECODERS
+except ImportError:
+    _DECODERS = ("gzip", "deflate")
+ACCEPT_ENCODING = ", ".join(coding for coding in _DECODERS if coding != "identity")
+
+_request_times: deque[float] = deque()
+_request_times_lock = threading.Lock()
+
+_shared_client: httpx.Client | None = None
+_shared_client_lock = threading.Lock()
+
+# Headers built by load_auth_headers() are reused for this many seconds, so
+# a long-running process (the daemon in explorations/) does not query the
+# token table on every call. A token changed with `slbp service-token set`
+# is picked up once this expires.
+AUTH_CACHE_S = 300
+
+_auth_cache: tuple[float, dict[str, str]] | None = None
+_auth_cache_lock = threading.Lock()
+
+
+class _Flight:
+    """One in-flight GET that identical concurrent callers wait on."""
+
+    __slots__ = ("done", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: dict | None = None
+
+
+_inflight: dict[tuple, _Flight] = {}
+_inflight_lock = threading.Lock()
+
+# Local indexes fed from every successful GET: observer(path, data). They
+# read and rewrite state files, so they run on one background thread rather
+# than the request path; call flush_observers() before reading an index that
+# must reflect the responses fetched so far.
+_OBSERVERS = (post_index.observe, submolt_directory.observe, interactions.observe)
+
+_observations: queue.Queue = queue.Queue()
+_observer_thread: threading.Thread | None = None
+_observer_thread_lock = threading.Lock()
+
+
+def _drain_observations() -> None:
+    while True:
+        item = _observations.get()
+        if isinstance(item, threading.Event):
+            item.set()
+            continue
+        path, data = item
+        for observe in _OBSERVERS:
+            try:
+                observe(path, data)
+            except Exception as e:
+                log(f"api: {observe.__module__}.observe failed for {path}: {e}")
+
+
+def _queue_observation(path: str, data: object) -> None:
+    global _observer_thread
+    with _observer_thread_lock:
+        if _observer_thread is None:
+            _observer_thread = threading.Thread(
+                target=_drain_observations, name="moltbook-observers", daemon=True
+            )
+            _observer_thread.start()
+            atexit.register(flush_observers)
+    _observations.put((path, data))
+
+
+def flush_observers(timeout: float = 10.0) -> bool:
+    """Wait until every response queued so far has been indexed.
+
+    Returns False if that took longer than *timeout* seconds.
+    """
+    if _observer_thread is None:
+        return True
+    done = threading.Event()
+    _observations.put(done)
+    return done.wait(timeout)
+
+
+def _note_request() -> None:
+    now = time.monotonic()
+    with _request_times_lock:
+        _request_times.append(now)
+        while _request_times and now - _request_times[0] > 60:
+            _request_times.popleft()
+
+
+def requests_last_minute() -> int:
+    """Number of API requests this process made in the last 60 seconds."""
+    now = time.monotonic()
+    with _request_times_lock:
+        while _request_times and now - _request_times[0] > 60:
+            _request_times.popleft()
+        return len(_request_times)
+
+
+def load_auth_headers(tool_name: str) -> tuple[dict[str, str] | None, str | None]:
+    """Build JSON request headers carrying the moltbook service token.
+
+    Reuses the headers built in the last AUTH_CACHE_S seconds. Returns
+    ``(headers, None)`` on success, or ``(None, message)`` with a
+    user-facing error prefixed by *tool_name*.
+    """
+    global _auth_cache
+    with _auth_cache_lock:
+        if _auth_cache is not None and time.monotonic() - _auth_cache[0] < AUTH_CACHE_S:
+            return dict(_auth_cache[1]), None
+
+    try:
+        tokens, missing = load_latest_service_tokens_from_db(["moltbook"])
+    except Exception as e:
+        return None, f"{tool_name}: failed to load moltbook service token: {e}"
+    if missing:
+        return None, (
+            f"{tool_name}: no service token found for 'moltbook'. "
+            "Create one with: slbp service-token set moltbook <token>"
+        )
+
+    headers: dict[str, str] = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Accept-Encoding": ACCEPT_ENCODING,
+    }
+    headers = apply_service_tokens_to_headers(headers, tokens)
+    if not any(k.lower() == "authorization" for k in headers):
+        headers["Authorization"] = f"Bearer {next(iter(tokens.values()))}"
+    with _auth_cache_lock:
+        _auth_cache = (time.monotonic(), headers)
+    return dict(headers), None
+
+
+def api_url(path: str) -> str:
+    """Full URL for an API *path* — normalizes slashes."""
+    return BASE_URL.rstrip("/") + "/" + path.lstrip("/")
+
+
+def decode_json(resp: httpx.Response, label: str) -> object:
+    """Parse *resp*'s body as JSON, with orjson when it is installed.
+
+    Logs the body size, transfer coding and time spent decoding. Raises
+    ValueError if the body is not valid JSON.
+    """
+    body = resp.content
+    started = time.perf_counter()
+    data = orjson.loads(body) if orjson is not None else json.loads(body)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    log(
+        f"api: decoded {len(body)} bytes from {label} in {elapsed_ms:.2f} ms "
+        f"({'orjson' if orjson is not None else 'json'}, "
+        f"{resp.headers.get('content-encoding') or 'identity'})"
+    )
+    return data
+
+
+def new_client() -> httpx.Client:
+    return httpx.Client(follow_redirects=True, timeout=20)
+
+
+def shared_client() -> httpx.Client:
+    """Process-wide pooled client, so repeated tool calls reuse connections.
+
+    Never close it; use new_client() for a client scoped to one call.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None or _shared_client.is_closed:
+            _shared_client = httpx.Client(
+                follow_redirects=True,
+                timeout=20,
+                limits=httpx.Limits(max_connections=MAX_CONCURRENCY * 2),
+            )
+        return _shared_client
+
+
+def get_json(
+    client: httpx.Client,
+    path: str,
+    headers: dict[str, str],
+    use_cache: bool = False,
+) -> dict:
+    """GET *path* and parse the JSON body.
+
+    Returns a dict with ``status``, ``content_type``, ``data`` (parsed JSON
+    or None), ``text`` (raw body when it is not JSON), ``json_error`` and
+    ``error`` (set for transport errors, HTTP >= 400 and non-JSON bodies);
+    never raises. With *use_cache*, a fresh entry from helpers/response_cache.py
+    is returned instead of making a request. Successful responses to
+    cacheable paths are always stored.
+
+    Identical GETs (same path and headers) issued concurrently share one
+    HTTP request: the first caller fetches, the others wait for it and get
+    the same result dict, which callers must therefore not mutate.
+    """
+    scope = _cache_scope(headers)
+    if use_cache:
+        cached = response_cache.get(path, scope)
+        if cached is not None:
+            log(f"api: GET {path} served from cache")
+            return cached
+
+    key = (response_cache.cache_key(path), frozenset(headers.items()))
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        log(f"api: GET {path} joined an in-flight request")
+        return flight.result
+
+    try:
+        flight.result = _fetch_json(client, path, headers, scope)
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        if flight.result is None:
+            flight.result = {**_empty_result(), "error": f"HTTP error during GET {path}"}
+        flight.done.set()
+    return flight.result
+
+
+def _empty_result() -> dict:
+    return {
+        "status": 0,
+        "content_type": None,
+        "data": None,
+        "text": None,
+        "json_error": None,
+        "error": None,
+    }
+
+
+def _cache_scope(headers: dict[str, str]) -> str:
+    """Cache namespace for the account the *headers* authenticate as."""
+    auth = next((v for k, v in headers.items() if k.lower() == "authorization"), "")
+    return hashlib.sha256(auth.encode("utf-8")).hexdigest()[:16] + ":"
+
+
+def _fetch_json(client: httpx.Client, path: str, headers: dict[str, str], scope: str) -> dict:
+    result = _empty_result()
+    _note_request()
+    try:
+        resp = client.get(api_url(path), headers=headers)
+    except Exception as e:
+        result["error"] = f"HTTP error during GET {path}: {e}"
+        return result
+
+    result["status"] = resp.status_code
+    result["content_type"] = resp.headers.get("content-type")
+    if is_json_content_type(result["content_type"]):
+        try:
+            result["data"] = decode_json(resp, f"GET {path}")
+        except Exception as e:
+            result["json_error"] = f"Failed to parse JSON: {e}"
+    if result["data"] is None:
+        result["text"] = resp.text
+
+    if resp.status_code >= 400:
+        result["error"] = f"GET {path} failed (HTTP {resp.status_code})"
+    elif result["data"] is None:
+        result["error"] = result["json_error"] or f"GET {path} returned a non-JSON response"
+    else:
+        response_cache.put(path, result, scope)
+        _queue_observation(path, result["data"])
+    return result
+
+
+def fetch_many(
+    client: httpx.Client,
+    paths: list[str],
+    headers: dict[str, str],
+    use_cache: bool = False,
+) -> dict[str, dict]:
+    """GET every path in *paths* concurrently; returns {path: get_json result}."""
+    unique = list(dict.fromkeys(paths))
+    if not unique:
+        return {}
+    log(f"api: fetching {len(unique)} path(s) concurrently")
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(unique))) as pool:
+        results = pool.map(lambda p: get_json(client, p, headers, use_cache), unique)
+        return dict(zip(unique, results))
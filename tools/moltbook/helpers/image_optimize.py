@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+
+from src.utils.log import log
+from tools.moltbook.helpers.local_state import state_dir
+from tools.moltbook.helpers.upload import ALLOWED_IMAGE_TYPES, file_sha256
+
+# Re-encoding ladder: each quality is tried at the current size before the
+# image is scaled down by _SCALE_STEP and the ladder starts over.
+_QUALITIES = (85, 75, 65, 50)
+_SCALE_STEP = 0.75
+_MAX_SCALE_ROUNDS = 8
+_MIN_SIDE = 64
+
+
+def _cache_dir() -> str:
+    path = os.path.join(state_dir(), "image_cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _encode(image, fmt: str, quality: int, dest: str) -> int:
+    """Encode *image* to *dest* without metadata; returns the encoded size."""
+    if fmt == "WEBP":
+        image.save(dest, "WEBP", quality=quality, method=6)
+    else:
+        image.convert("RGB").save(
+            dest, "JPEG", quality=quality, optimize=True, progressive=True
+        )
+    return os.path.getsize(dest)
+
+
+def fit_image(
+    tool_name: str, filepath: str, max_bytes: int, source_hash: str | None = None
+) -> tuple[str | None, str | None]:
+    """Return a path to an upload-ready version of *filepath* under *max_bytes*.
+
+    Files that are already an accepted format and small enough are returned
+    unchanged. Anything else is re-encoded (WebP, or progressive JPEG when
+    Pillow lacks WebP support) and scaled down until it fits, with metadata
+    stripped. Results are cached by source content hash, so optimizing the
+    same source again is free. Pass *source_hash* when the caller already
+    hashed the file.
+
+    Returns ``(path, None)`` or ``(None, message)`` with a user-facing error
+    prefixed by *tool_name*.
+    """
+    content_type, _ = mimetypes.guess_type(filepath)
+    try:
+        size = os.path.getsize(filepath)
+    except OSError as e:
+        return None, f"{tool_name}: could not stat file: {e}"
+    if content_type in ALLOWED_IMAGE_TYPES and size <= max_bytes:
+        return filepath, None
+
+    try:
+        from PIL import Image, features
+    except ImportError:
+        return None, (
+            f"{tool_name}: file is {size} bytes ({content_type!r}) and cannot be "
+            f"shrunk to fit {max_bytes} bytes: install Pillow to enable image optimization."
+        )
+
+    if source_hash is None:
+        try:
+            source_hash = file_sha256(filepath)
+        except OSError as e:
+            return None, f"{tool_name}: could not read file: {e}"
+
+    fmt = "WEBP" if features.check("webp") else "JPEG"
+    extension = ".webp" if fmt == "WEBP" else ".jpg"
+    cached = os.path.join(_cache_dir(), f"{source_hash}-{max_bytes}{extension}")
+    if os.path.exists(cached):
+        log(f"{tool_name}: using cached optimized image {cached}")
+        return cached, None
+
+    try:
+        with Image.open(filepath) as opened:
+            opened.seek(0)  # first frame of animations
+            # Copying pixel data only drops EXIF and other metadata.
+            has_alpha = "A" in opened.getbands() or "transparency" in opened.info
+            image = opened.convert("RGBA" if has_alpha else "RGB")
+    except Exception as e:
+        return None, f"{tool_name}: could not open image for optimization: {e}"
+
+    tmp = f"{cached}.{os.getpid()}.tmp"
+    try:
+        for _ in range(_MAX_SCALE_ROUNDS):
+            for quality in _QUALITIES:
+                encoded = _encode(image, fmt, quality, tmp)
+                if encoded <= max_bytes:
+                    os.replace(tmp, cached)
+                    log(
+                        f"{tool_name}: optimized {filepath} from {size} to {encoded} bytes "
+                        f"({fmt}, q={quality}, {image.width}x{image.height})"
+                    )
+                    return cached, None
+            width = int(image.width * _SCALE_STEP)
+            height = int(image.height * _SCALE_STEP)
+            if min(width, height) < _MIN_SIDE:
+                break
+            image = image.resize((width, height), Image.LANCZOS)
+    except Exception as e:
+        return None, f"{tool_name}: image optimization failed: {e}"
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return None, f"{tool_name}: could not shrink the image below {max_bytes} bytes."
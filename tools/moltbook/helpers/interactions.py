@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import re
+import time
+from typing import Iterable
+
+from tools.moltbook.helpers.local_state import load_state, update_state
+
+# Local ledger of our interactions with other moltys — upvotes, downvotes,
+# comments and follows, counted per author with the time of the latest one —
+# so follow decisions need no profile lookups. Authors are resolved from
+# post and comment IDs seen in earlier GET responses (see api.get_json).
+# Follows made before this ledger existed, or outside these tools, are
+# learned from the authors in the following feed and from the
+# already_following flag in upvote responses (note_following()).
+_LEDGER_STATE = "interactions"
+_AUTHORS_STATE = "content_authors"
+
+# Most content-ID -> author mappings kept; the oldest are dropped first.
+MAX_KNOWN_IDS = 5000
+
+# Affinity halves for every this many days since the last interaction.
+HALF_LIFE_DAYS = 14
+
+# How much each kind of interaction says about wanting to see more.
+_WEIGHTS = {"upvote": 1.0, "comment": 2.0, "downvote": -2.0}
+
+_CONTENT_PATH_RE = re.compile(r"^/(feed|posts|search|home|submolts)(/|\?|$)")
+_FOLLOWING_FEED_RE = re.compile(r"^/feed\?(.*&)?filter=following(&|$)")
+_MAX_WALK_DEPTH = 6
+
+# content ID -> author pairs this process has already stored or found
+# stored, so repeat listings skip the state file. observe() runs on the
+# single observer thread in helpers/api.py, so this needs no lock.
+_known: dict[str, str] = {}
+
+
+def _author_name(item: dict) -> str | None:
+    author = item.get("author")
+    if isinstance(author, dict):
+        author = author.get("name")
+    author = author or item.get("author_name")
+    return author if isinstance(author, str) else None
+
+
+def _collect_authors(
+    value: object,
+    found: dict[str, str],
+    depth: int = 0,
+    posts_only: bool = False,
+) -> None:
+    if depth > _MAX_WALK_DEPTH:
+        return
+    if isinstance(value, list):
+        for item in value:
+            _collect_authors(item, found, depth + 1, posts_only)
+        return
+    if not isinstance(value, dict):
+        return
+    author = _author_name(value)
+    if author and value.get("id") is not None and (not posts_only or "title" in value):
+        found[str(value["id"])] = author
+    for child in value.values():
+        if isinstance(child, (dict, list)):
+            _collect_authors(child, found, depth + 1, posts_only)
+
+
+def observe(path: str, data: object) -> None:
+    """Remember who wrote each post and comment in a successful GET response.
+
+    Authors of posts in the following feed are also recorded as followed.
+    """
+    path = "/" + path.lstrip("/")
+    if not _CONTENT_PATH_RE.match(path):
+        return
+    if _FOLLOWING_FEED_RE.match(path):
+        followed: dict[str, str] = {}
+        _collect_authors(data, followed, posts_only=True)
+        note_following(set(followed.values()), True)
+    found: dict[str, str] = {}
+    _collect_authors(data, found)
+    new = {content_id: a for content_id, a in found.items() if _known.get(content_id) != a}
+    if not new:
+        return
+
+    def _merge(state: dict) -> bool:
+        by_id = state.setdefault("by_id", {})
+        if len(_known) > 2 * MAX_KNOWN_IDS:
+            _known.clear()
+        _known.update(by_id)
+        changed = {content_id: a for content_id, a in new.items() if by_id.get(content_id) != a}
+        by_id.update(changed)
+        for content_id in list(by_id)[: max(len(by_id) - MAX_KNOWN_IDS, 0)]:
+            del by_id[content_id]
+        return bool(changed)
+
+    update_state(_AUTHORS_STATE, _merge, compact=True)
+    _known.update(new)
+
+
+def author_of(content_id: str) -> str | None:
+    """Author of a post or comment we have seen, or None."""
+    return load_state(_AUTHORS_STATE).get("by_id", {}).get(str(content_id))
+
+
+def record(author: str, kind: str) -> None:
+    """Count one *kind* ("upvote", "downvote" or "comment") of interaction with *author*."""
+    def _add(state: dict) -> None:
+        entry = state.setdefault("authors", {}).setdefault(author, {})
+        entry[kind] = entry.get(kind, 0) + 1
+        entry["last_at"] = time.time()
+
+    update_state(_LEDGER_STATE, _add)
+
+
+def set_following(author: str, following: bool) -> None:
+    def _set(state: dict) -> None:
+        entry = state.setdefault("authors", {}).setdefault(author, {})
+        entry["following"] = following
+        entry["follow_changed_at"] = time.time()
+
+    update_state(_LEDGER_STATE, _set)
+
+
+def note_following(authors: Iterable[str], following: bool) -> None:
+    """Record follow state learned from an API response, writing only changes."""
+    def _note(state: dict) -> bool:
+        changed = False
+        for author in authors:
+            entry = state.setdefault("authors", {}).setdefault(author, {})
+            if entry.get("following") != following:
+                entry["following"] = following
+                changed = True
+        return changed
+
+    update_state(_LEDGER_STATE, _note)
+
+
+def affinity(entry: dict, now: float) -> float:
+    """Weighted interaction count, decayed by time since the last interaction."""
+    raw = sum(weight * entry.get(kind, 0) for kind, weight in _WEIGHTS.items())
+    age_days = max(now - entry.get("last_at", now), 0) / 86400
+    return raw * 0.5 ** (age_days / HALF_LIFE_DAYS)
+
+
+def follow_candidates(
+    min_interactions: int, limit: int, exclude: Iterable[str] = ()
+) -> list[dict]:
+    """Authors we are not following, with at least *min_interactions* positive ones.
+
+    One pass over the ledger; best affinity first. Names in *exclude* (our
+    own) are never returned.
+    """
+    now = time.time()
+    excluded = set(exclude)
+    candidates: list[dict] = []
+    for author, entry in load_state(_LEDGER_STATE).get("authors", {}).items():
+        if entry.get("following") or author in excluded:
+            continue
+        positive = entry.get("upvote", 0) + entry.get("comment", 0)
+        if positive < min_interactions:
+            continue
+        score = affinity(entry, now)
+        if score <= 0:
+            continue
+        candidates.append({
+            "name": author,
+            "affinity": round(score, 2),
+            "upvotes": entry.get("upvote", 0),
+            "comments": entry.get("comment", 0),
+            "downvotes": entry.get("downvote", 0),
+            "days_since_last": round((now - entry.get("last_at", now)) / 86400, 1),
+        })
+    candidates.sort(key=lambda c: c["affinity"], reverse=True)
+    return candidates[:limit]
+
+
+def following() -> list[str]:
+    """Moltys the ledger has recorded us following."""
+    authors = load_state(_LEDGER_STATE).get("authors", {})
+    return sorted(name for name, entry in authors.items() if entry.get("following"))
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Callable
+
+from src.utils.log import log
+
+# Small JSON documents the Moltbook tools keep between sessions (learned
+# server behaviour, cursors, ...). Resolved relative to this file:
+# tools/moltbook/helpers/ -> ../../../.moltbook-state/
+# Override with the MOLTBOOK_STATE_DIR environment variable.
+_STATE_DIR = os.environ.get("MOLTBOOK_STATE_DIR") or os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", ".moltbook-state"
+)
+
+_lock = threading.Lock()
+
+
+def state_dir() -> str:
+    """Return the local state directory, creating it if needed."""
+    path = os.path.normpath(_STATE_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _state_path(name: str) -> str:
+    return os.path.join(state_dir(), f"{name}.json")
+
+
+def _read(name: str) -> dict:
+    try:
+        with open(_state_path(name), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write(name: str, data: dict, compact: bool = False) -> None:
+    path = _state_path(name)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            if compact:
+                json.dump(data, f, separators=(",", ":"))
+            else:
+                json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except OSError as e:
+        log(f"local_state: could not write {name!r}: {e}")
+
+
+def load_state(name: str) -> dict:
+    """Load the state document *name*; returns {} if missing or unreadable."""
+    with _lock:
+        return _read(name)
+
+
+def save_state(name: str, data: dict) -> None:
+    """Atomically replace the state document *name* with *data*."""
+    with _lock:
+        _write(name, data)
+
+
+def update_state(name: str, fn: Callable[[dict], bool | None], compact: bool = False) -> dict:
+    """Load *name*, let *fn* mutate it in place, save it, and return it.
+
+    If *fn* returns False nothing changed and the file is not rewritten.
+    *compact* writes the JSON without whitespace, for large documents
+    (indexes) that are never read by hand.
+
+    Failures to persist are logged and otherwise ignored — local state is an
+    optimisation and must never break a tool call.
+    """
+    with _lock:
+        data = _read(name)
+        if fn(data) is not False:
+            _write(name, data, compact)
+        return data
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import ast
+import importlib
+import json
+import os
+import threading
+from types import ModuleType
+
+from src.utils.log import log
+from tools.moltbook import TOOL_NAMESPACE
+
+# Registry of the tools in this package, built without importing them: each
+# tools/moltbook/<module>.py is parsed and its DEFINITION literal read from
+# the syntax tree. The result is kept in memory and in MANIFEST_PATH
+# (git-ignored), one entry per tool:
+#   {"module", "file", "mtime_ns", "size", "qualified_name", "definition",
+#    "needs_approval"}
+# where needs_approval is "module:function" for tools with an approval hook,
+# else None. An entry is rebuilt only when its file's mtime or size changes,
+# so a host can list every tool without importing any tool code and import a
+# module only when the tool is first called (see load_tool()).
+MANIFEST_VERSION = 1
+
+_TOOLS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+MANIFEST_PATH = os.path.join(_TOOLS_DIR, "tool_manifest.json")
+
+_lock = threading.Lock()
+_index: dict[str, dict] | None = None
+
+
+def _tool_files() -> dict[str, os.stat_result]:
+    files: dict[str, os.stat_result] = {}
+    for entry in os.scandir(_TOOLS_DIR):
+        if entry.is_file() and entry.name.endswith(".py") and not entry.name.startswith("_"):
+            files[entry.name] = entry.stat()
+    return files
+
+
+def _literal_definition(tree: ast.Module) -> dict | None:
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            target, value = node.target, node.value
+        else:
+            continue
+        if isinstance(target, ast.Name) and target.id == "DEFINITION":
+            definition = ast.literal_eval(value)
+            return definition if isinstance(definition, dict) else None
+    return None
+
+
+def _build_entry(filename: str, stat: os.stat_result) -> dict | None:
+    """Manifest entry for one tool file, or None if it defines no tool."""
+    module = f"tools.moltbook.{filename[:-3]}"
+    path = os.path.join(_TOOLS_DIR, filename)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError) as e:
+        log(f"manifest: could not parse {filename}: {e}")
+        return None
+    functions = {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+    if "execute" not in functions:
+        return None
+    try:
+        definition = _literal_definition(tree)
+    except ValueError:
+        # DEFINITION is computed, not a literal: fall back to importing it.
+        definition = getattr(importlib.import_module(module), "DEFINITION", None)
+    if not isinstance(definition, dict) or "function" not in definition:
+        return None
+    return {
+        "module": module,
+        "file": filename,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "qualified_name": f"{TOOL_NAMESPACE}_{definition['function']['name']}",
+        "definition": definition,
+        "needs_approval": f"{module}:needs_approval" if "needs_approval" in functions else None,
+    }
+
+
+def _read_manifest() -> dict[str, dict]:
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    tools = data.get("tools")
+    return tools if isinstance(tools, dict) else {}
+
+
+def _write_manifest(index: dict[str, dict]) -> None:
+    data = {"version": MANIFEST_VERSION, "namespace": TOOL_NAMESPACE, "tools": index}
+    tmp = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, MANIFEST_PATH)
+    except OSError as e:
+        log(f"manifest: could not write {MANIFEST_PATH}: {e}")
+
+
+def load_manifest() -> dict[str, dict]:
+    """{tool name: entry} for every tool, rebuilding entries whose file changed.
+
+    Costs one stat per tool file when nothing changed.
+    """
+    global _index
+    with _lock:
+        cached = _index if _index is not None else _read_manifest()
+        by_file = {entry["file"]: (name, entry) for name, entry in cached.items()}
+        index: dict[str, dict] = {}
+        for filename, stat in sorted(_tool_files().items()):
+            name, entry = by_file.get(filename, (None, None))
+            if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                entry = _build_entry(filename, stat)
+                if entry is None:
+                    continue
+                name = entry["definition"]["function"]["name"]
+            index[name] = entry
+        if index != cached:
+            _write_manifest(index)
+        _index = index
+        return index
+
+
+def definitions() -> list[dict]:
+    """Every tool's DEFINITION, in file order."""
+    return [entry["definition"] for entry in load_manifest().values()]
+
+
+def load_tool(name: str) -> ModuleType:
+    """Import the module implementing tool *name* (KeyError if unknown)."""
+    return importlib.import_module(load_manifest()[name]["module"])
+
+
+def needs_approval(name: str, args: dict) -> bool:
+    """Run tool *name*'s approval hook, importing its module only if it has one."""
+    hook = load_manifest()[name]["needs_approval"]
+    if hook is None:
+        return False
+    module, function = hook.split(":")
+    return bool(getattr(importlib.import_module(module), function)(args))
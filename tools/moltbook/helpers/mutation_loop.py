@@ -1,22 +1,136 @@
 from __future__ import annotations
 
 import json
-
-import httpx
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable
 
 from src.utils.llm.streaming import StreamingLLM
 from src.utils.log import log
-from tools.moltbook.helpers.verification import find_verification_obj, solve_challenge
+from tools.moltbook.helpers import api, response_cache, verification_stats
+from tools.moltbook.helpers.verification import (
+    find_verification_obj,
+    forget_answer,
+    remember_answer,
+    solve_challenge,
+)
 
 MAX_VERIFY_ATTEMPTS = 5
 
 # The Moltbook API returns 409 (already used), 410 (expired), or 404
 # (invalid) for the verification code in various error scenarios — all of
 # which require re-creating the post to get a fresh code.
-# It is unclear whether a *wrong answer* also permanently consumes the code.
-# Set this to True if retrying /verify with the same code after a wrong
-# answer keeps returning 409.
-REPOST_ON_WRONG_ANSWER = False
+# Whether a *wrong answer* also permanently consumes the code is learned at
+# runtime (see helpers/verification_stats.py): until it is known, the loop
+# retries the same code once and records whether /verify answers 409.
+# Set this to True or False to override the learned behaviour.
+REPOST_ON_WRONG_ANSWER: bool | None = None
+
+# The verification LLM client (built from the active token in the database)
+# is reused for this many seconds, like api.AUTH_CACHE_S for the request
+# headers, so a long-running process (the daemon in explorations/) does not
+# query the database and build a client on every mutation.
+LLM_CACHE_S = 300
+
+_llm_cache: tuple[float, StreamingLLM] | None = None
+_llm_cache_lock = threading.Lock()
+
+
+def _load_llm_config() -> dict | None:
+    """Load just the fields needed to instantiate StreamingLLM."""
+    from src.data import get_pool
+    from src.utils.sql.kv_manager import KVManager
+
+    try:
+        pool = get_pool()
+    except Exception:
+        return None
+    with pool.get_connection() as conn:
+        kv = KVManager(conn)
+        active_token = kv.get_value("active_token")
+        if not active_token:
+            return None
+        provider = active_token["provider"]
+        token_name = active_token.get("name", "")
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT token_value, endpoint_url
+                FROM tokens
+                WHERE BINARY provider = BINARY %s
+                  AND BINARY token_name = BINARY %s
+                LIMIT 1
+                """,
+                (provider, token_name),
+            )
+            row = cursor.fetchone()
+        if not row:
+            return None
+        token_value, endpoint_url = row
+        model = kv.get_value("model") or None
+    return {"endpoint_url": endpoint_url, "token_value": token_value, "model": model}
+
+
+def verification_llm(tool_name: str) -> tuple[StreamingLLM | None, str | None]:
+    """The LLM client verification challenges are solved with.
+
+    Returns ``(llm, None)``, or ``(None, message)`` with a user-facing error
+    prefixed by *tool_name*.
+    """
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is not None and time.monotonic() - _llm_cache[0] < LLM_CACHE_S:
+            return _llm_cache[1], None
+
+    llm_config = _load_llm_config()
+    if not llm_config:
+        return None, (
+            f"{tool_name}: could not load LLM configuration from the database. "
+            "Make sure an active token and endpoint are configured."
+        )
+    llm = StreamingLLM(
+        endpoint=llm_config["endpoint_url"],
+        token=llm_config["token_value"],
+        model=llm_config["model"],
+        timeout_s=30,
+    )
+    with _llm_cache_lock:
+        _llm_cache = (time.monotonic(), llm)
+    return llm, None
+
+
+def mutation_succeeded(result: str) -> bool:
+    """Whether a run_mutation_loop() result string reports success."""
+    return result.startswith(("mutation_loop: request succeeded", "mutation_loop: verified"))
+
+
+def _code_deadline(verification_obj: dict, issued_at: float) -> float | None:
+    """Monotonic time at which the code expires, if it can be determined.
+
+    Uses the server's ``expires_at`` when present, otherwise the lifetime
+    learned from earlier 410 responses.
+    """
+    expires_at = verification_obj.get("expires_at")
+    if isinstance(expires_at, str):
+        try:
+            expiry = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
+            if expiry.tzinfo is None:
+                expiry = expiry.replace(tzinfo=timezone.utc)
+            remaining = (expiry - datetime.now(timezone.utc)).total_seconds()
+            return issued_at + remaining
+        except ValueError:
+            pass
+    lifetime = verification_stats.estimated_code_lifetime()
+    if lifetime is None:
+        return None
+    return issued_at + lifetime
+
+
+def _should_repost_on_wrong_answer() -> bool | None:
+    if REPOST_ON_WRONG_ANSWER is not None:
+        return REPOST_ON_WRONG_ANSWER
+    return verification_stats.wrong_answer_consumes()
 
 
 def run_mutation_loop(
@@ -26,6 +140,7 @@ def run_mutation_loop(
     base_headers: dict,
     base_url: str,
     data: dict | None = None,
+    on_success: Callable[[dict], None] | None = None,
 ) -> str:
     """Submit a mutation and handle the verification challenge loop.
 
@@ -34,18 +149,33 @@ def run_mutation_loop(
     as DELETE.  Retries the verification challenge up to MAX_VERIFY_ATTEMPTS
     times.  404 / 409 / 410 responses from /verify all trigger a full
     re-submission to obtain a fresh verification code.  Whether a wrong answer
-    also requires a re-submission is controlled by the REPOST_ON_WRONG_ANSWER
-    flag at the top of this module.
+    also requires a re-submission is learned from the server (or forced with
+    the REPOST_ON_WRONG_ANSWER flag at the top of this module).
+
+    The age of the current code is tracked; before re-using a code after a
+    wrong answer, the loop re-submits early if the code's remaining lifetime
+    is shorter than the expected solve time, rather than letting the answer
+    land on an expired code.
+
+    On success, *on_success* (if given) is called with the JSON body that
+    completed the mutation — after a verification, the /verify body merged
+    over the submission's — so callers can read IDs without parsing the
+    result string.
 
     Returns a human-readable result string in all cases.
     """
     verification_code: str | None = None
     challenge_text = ""
+    code_issued_at = 0.0
+    code_deadline: float | None = None
+    code_attempts = 0
+    probing_wrong_answer = False
     needs_resubmit = True
     attempts = 0
     answer = ""
     hint = ""
     url = f"{base_url}{endpoint}"
+    base_headers = {**base_headers, "Accept-Encoding": api.ACCEPT_ENCODING}
 
     while attempts < MAX_VERIFY_ATTEMPTS:
 
@@ -54,12 +184,12 @@ def run_mutation_loop(
                 kwargs = {"headers": base_headers, "timeout": 20, "follow_redirects": True}
                 if data is not None:
                     kwargs["json"] = data
-                resp = httpx.request(method, url, **kwargs)
+                resp = api.shared_client().request(method, url, **kwargs)
             except Exception as e:
                 return f"mutation_loop: HTTP error during {method} {endpoint}: {e}"
 
             try:
-                resp_data = resp.json()
+                resp_data = api.decode_json(resp, f"{method} {endpoint}")
             except Exception:
                 return (
                     f"mutation_loop: non-JSON response from {endpoint} "
@@ -75,20 +205,44 @@ def run_mutation_loop(
             verification_obj = find_verification_obj(resp_data)
             if not verification_obj:
                 # No verification required — request completed immediately.
+                response_cache.clear()
+                if on_success is not None:
+                    on_success(resp_data)
                 post_id = resp_data.get("post", {}).get("id", "unknown")
                 return f"mutation_loop: request succeeded (id: {post_id})."
 
             verification_code = verification_obj["verification_code"]
             challenge_text = verification_obj["challenge_text"]
             log(repr((verification_code, challenge_text)))
+            code_issued_at = time.monotonic()
+            code_deadline = _code_deadline(verification_obj, code_issued_at)
+            code_attempts = 0
             needs_resubmit = False
 
+        # A fresh code is as good as it gets; only a code being re-used after
+        # a wrong answer is worth abandoning early.
+        expected_solve = verification_stats.expected_solve_time()
+        if code_attempts > 0 and code_deadline is not None and expected_solve is not None:
+            remaining = code_deadline - time.monotonic()
+            if remaining < expected_solve:
+                log(
+                    f"mutation_loop: code has {remaining:.1f}s left, expected solve "
+                    f"takes {expected_solve:.1f}s — re-submitting early."
+                )
+                needs_resubmit = True
+                verification_code = None
+                probing_wrong_answer = False
+                continue
+
         # Solve and verify.
         attempts += 1
+        code_attempts += 1
+        solve_started = time.monotonic()
         answer = solve_challenge(llm, challenge_text)
+        verification_stats.record_solve_time(time.monotonic() - solve_started)
 
         try:
-            verify_resp = httpx.post(
+            verify_resp = api.shared_client().post(
                 f"{base_url}/verify",
                 json={"verification_code": verification_code, "answer": answer},
                 headers=base_headers,
@@ -98,6 +252,17 @@ def run_mutation_loop(
         except Exception as e:
             return f"mutation_loop: HTTP error while verifying: {e}"
 
+        # 404 / 409 say nothing about the code lifetime.
+        if verify_resp.status_code not in (404, 409):
+            code_age = time.monotonic() - code_issued_at
+            verification_stats.record_code_age(code_age, expired=verify_resp.status_code == 410)
+
+        if probing_wrong_answer and verify_resp.status_code not in (404, 410):
+            # This code was re-used after a wrong answer: a 409 now means
+            # wrong answers consume the code.
+            verification_stats.record_wrong_answer_consumes(verify_resp.status_code == 409)
+        probing_wrong_answer = False
+
         if verify_resp.status_code == 410:
             # Verification code expired — re-submit.
             needs_resubmit = True
@@ -105,7 +270,7 @@ def run_mutation_loop(
             continue
 
         try:
-            verify_data = verify_resp.json()
+            verify_data = api.decode_json(verify_resp, "POST /verify")
             log(f"""
 Verification Response:
 
@@ -130,6 +295,12 @@ Verification Response:
             continue
 
         if verify_data.get("success"):
+            verification_stats.record_outcome(True)
+            remember_answer(challenge_text, answer)
+            # Cached reads may no longer reflect what we just changed.
+            response_cache.clear()
+            if on_success is not None:
+                on_success({**resp_data, **verify_data})
             post_id = (
                 verify_data.get("post", {}).get("id")
                 or verify_data.get("content_id")
@@ -143,10 +314,15 @@ Verification Response:
         # Incorrect answer — success=false in the response body (may be a 200
         # or a 4xx; the example shape is {success: false, error: "Incorrect
         # answer", hint: "...", content_id: "..."}).
+        verification_stats.record_outcome(False)
+        forget_answer(challenge_text)
         hint = verify_data.get("hint", "")
-        if REPOST_ON_WRONG_ANSWER:
+        repost = _should_repost_on_wrong_answer()
+        if repost:
             needs_resubmit = True
             verification_code = None
+        elif repost is None:
+            probing_wrong_answer = True
 
     return (
         f"mutation_loop: exhausted {MAX_VERIFY_ATTEMPTS} verification attempts "
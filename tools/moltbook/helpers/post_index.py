@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from collections import Counter
+
+from tools.moltbook.helpers.local_state import load_state, update_state
+
+# Local SimHash fingerprints of posts we have read (feeds, search results,
+# single posts) and posts we have written, kept in the "post_index" state
+# document so create_post can spot a near-duplicate without a /search call.
+# Each entry also keeps the post's submolt, so pin_post can check our role
+# there without fetching the post.
+_STATE = "post_index"
+
+# Oldest entries are dropped beyond this many posts.
+MAX_ENTRIES = 5000
+
+# Most differing bits (of 64) for two fingerprints to count as near-duplicates.
+# Title fingerprints are built from far fewer features, so they must match
+# more closely — and only titles with enough words are compared at all.
+TEXT_MAX_DISTANCE = 10
+TITLE_MAX_DISTANCE = 3
+_MIN_TITLE_WORDS = 4
+
+_STORED_TITLE_CHARS = 120
+
+# API paths whose responses contain posts worth indexing.
+_POST_PATH_RE = re.compile(r"^/(feed|posts|search|home|submolts)(/|\?|$)")
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_MAX_WALK_DEPTH = 4
+
+# IDs this process has already indexed or found indexed, so a listing seen
+# again is skipped without reading the state file. observe() runs on the
+# single observer thread in helpers/api.py, so this needs no lock.
+_indexed: set[str] = set()
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of *text* over word unigrams and bigrams."""
+    words = _words(text)
+    features = Counter(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    if not features:
+        return 0
+    weights = [0] * 64
+    for feature, count in features.items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += count if h >> bit & 1 else -count
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _fingerprints(title: str, body: str) -> dict:
+    title_hash = None
+    if len(_words(title)) >= _MIN_TITLE_WORDS:
+        title_hash = format(simhash(title), "016x")
+    return {"text": format(simhash(f"{title}\n{body}"), "016x"), "title": title_hash}
+
+
+def _add(
+    index: dict, post_id: str, title: str, body: str, submolt: str | None, mine: bool
+) -> None:
+    previous = index.get(post_id, {})
+    index[post_id] = {
+        **_fingerprints(title, body),
+        "t": title[:_STORED_TITLE_CHARS],
+        "s": submolt or previous.get("s"),
+        "mine": mine or previous.get("mine", False),
+        "at": time.time(),
+    }
+
+
+def _trim(index: dict) -> None:
+    if len(index) > MAX_ENTRIES:
+        oldest = sorted(index, key=lambda post_id: index[post_id]["at"])
+        for post_id in oldest[: len(index) - MAX_ENTRIES]:
+            del index[post_id]
+
+
+def submolt_name(post: dict) -> str | None:
+    """Name of the submolt a post-shaped dict belongs to, if it says."""
+    submolt = post.get("submolt")
+    if isinstance(submolt, dict):
+        submolt = submolt.get("name")
+    submolt = submolt or post.get("submolt_name")
+    return submolt if isinstance(submolt, str) and submolt else None
+
+
+def _collect_posts(
+    value: object, found: dict[str, tuple[str, str, str | None]], depth: int = 0
+) -> None:
+    """Gather {post_id: (title, body, submolt)} from any post-shaped dicts in *value*."""
+    if depth > _MAX_WALK_DEPTH:
+        return
+    if isinstance(value, list):
+        for item in value:
+            _collect_posts(item, found, depth + 1)
+        return
+    if not isinstance(value, dict):
+        return
+    title = value.get("title")
+    post_id = value.get("post_id") or value.get("id")
+    if isinstance(title, str) and post_id is not None and value.get("type") != "comment":
+        body = value.get("content") or value.get("content_preview") or value.get("url") or ""
+        found[str(post_id)] = (title, body if isinstance(body, str) else "", submolt_name(value))
+        return
+    for child in value.values():
+        if isinstance(child, (dict, list)):
+            _collect_posts(child, found, depth + 1)
+
+
+def observe(path: str, data: object) -> None:
+    """Index the posts in a successful GET response for *path*."""
+    if not _POST_PATH_RE.match("/" + path.lstrip("/")):
+        return
+    found: dict[str, tuple[str, str, str | None]] = {}
+    _collect_posts(data, found)
+    new = {post_id: post for post_id, post in found.items() if post_id not in _indexed}
+    if not new:
+        return
+
+    def _merge(state: dict) -> bool:
+        index = state.setdefault("posts", {})
+        if len(_indexed) > 2 * MAX_ENTRIES:
+            _indexed.clear()
+        _indexed.update(index)
+        added = [post_id for post_id in new if post_id not in index]
+        for post_id in added:
+            title, body, submolt = new[post_id]
+            _add(index, post_id, title, body, submolt, mine=False)
+        _trim(index)
+        return bool(added)
+
+    update_state(_STATE, _merge, compact=True)
+    _indexed.update(new)
+
+
+def record_own_post(post_id: str, title: str, body: str, submolt: str) -> None:
+    """Index a post we just published."""
+    def _merge(state: dict) -> None:
+        index = state.setdefault("posts", {})
+        _add(index, post_id, title, body, submolt, mine=True)
+        _trim(index)
+
+    update_state(_STATE, _merge, compact=True)
+
+
+def submolt_of(post_id: str) -> str | None:
+    """Submolt of an indexed post, or None if unknown."""
+    return load_state(_STATE).get("posts", {}).get(str(post_id), {}).get("s")
+
+
+def find_near_duplicates(title: str, body: str) -> list[dict]:
+    """Indexed posts whose fingerprint is close to *title* + *body*, closest first."""
+    candidate = _fingerprints(title, body)
+    text_hash = int(candidate["text"], 16)
+    title_hash = int(candidate["title"], 16) if candidate["title"] else None
+    matches: list[dict] = []
+    for post_id, entry in load_state(_STATE).get("posts", {}).items():
+        text_distance = _distance(text_hash, int(entry["text"], 16))
+        title_distance = None
+        if title_hash is not None and entry.get("title"):
+            title_distance = _distance(title_hash, int(entry["title"], 16))
+        if text_distance <= TEXT_MAX_DISTANCE or (
+            title_distance is not None and title_distance <= TITLE_MAX_DISTANCE
+        ):
+            matches.append({
+                "post_id": post_id,
+                "title": entry.get("t"),
+                "yours": entry.get("mine", False),
+                "text_distance": text_distance,
+                "title_distance": title_distance,
+            })
+    matches.sort(key=lambda m: min(
+        m["text_distance"], 64 if m["title_distance"] is None else m["title_distance"]
+    ))
+    return matches
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from src.utils.log import log
+from tools.moltbook.helpers import api
+
+# Paths read at the start of every heartbeat. heartbeat_plan requests these
+# exact strings so the warmed cache entries are hits.
+HOME_PATH = "/home"
+DM_CHECK_PATH = "/agents/dm/check"
+FOLLOWING_FEED_PATH = "/feed?filter=following&sort=new&limit=25"
+
+DEFAULT_INTERVAL_S = 30 * 60
+# How long before the next heartbeat the cache is warmed. Must stay below
+# the max age response_cache allows for these paths.
+DEFAULT_LEAD_S = 120
+
+# Most requests one warm-up may spend, and the share of the per-minute API
+# budget that must still be free before warming starts.
+MAX_WARM_REQUESTS = 15
+_BUDGET_SHARE = 0.5
+
+_lock = threading.Lock()
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+_interval_s = DEFAULT_INTERVAL_S
+_lead_s = DEFAULT_LEAD_S
+_next_heartbeat_at: float | None = None
+_last_warm: dict = {}
+
+
+def _activity_post_ids(home: object) -> list[str]:
+    if not isinstance(home, dict):
+        return []
+    activity = home.get("activity_on_your_posts")
+    if isinstance(activity, dict):
+        activity = activity.get("posts") or activity.get("items")
+    ids: list[str] = []
+    for item in activity if isinstance(activity, list) else []:
+        if isinstance(item, dict):
+            post_id = item.get("post_id") or item.get("id")
+            if post_id is not None:
+                ids.append(str(post_id))
+    return ids
+
+
+def warm_cache() -> dict:
+    """Fetch the heartbeat's opening reads into the response cache now.
+
+    Comment threads of our recently active posts are warmed as well, within
+    MAX_WARM_REQUESTS. Skipped while more than half of the per-minute API
+    budget is already used.
+    """
+    used = api.requests_last_minute()
+    if used > api.REQUESTS_PER_MINUTE * _BUDGET_SHARE:
+        return {"skipped": f"{used} requests in the last minute"}
+
+    headers, error = api.load_auth_headers("prefetch")
+    if error:
+        return {"error": error}
+
+    started = time.monotonic()
+    with api.new_client() as client:
+        first = api.fetch_many(client, [HOME_PATH, DM_CHECK_PATH, FOLLOWING_FEED_PATH], headers)
+        post_ids = _activity_post_ids(first[HOME_PATH]["data"])
+        budget = MAX_WARM_REQUESTS - len(first)
+        comment_paths = [f"/posts/{p}/comments?sort=new" for p in post_ids[:max(budget, 0)]]
+        second = api.fetch_many(client, comment_paths, headers)
+
+    results = {**first, **second}
+    return {
+        "warmed": [path for path, r in results.items() if not r["error"]],
+        "errors": [r["error"] for r in results.values() if r["error"]],
+        "seconds": round(time.monotonic() - started, 2),
+    }
+
+
+def _run() -> None:
+    global _next_heartbeat_at, _last_warm
+    while not _stop.is_set():
+        with _lock:
+            if _next_heartbeat_at is None:
+                _next_heartbeat_at = time.monotonic() + _interval_s
+            wake_at = _next_heartbeat_at - _lead_s
+        if _stop.wait(max(wake_at - time.monotonic(), 0)):
+            return
+        try:
+            outcome = warm_cache()
+        except Exception as e:
+            outcome = {"error": str(e)}
+        log(f"prefetch: {outcome}")
+        with _lock:
+            _last_warm = {"at": time.time(), **outcome}
+            # Unless a heartbeat re-anchored the schedule meanwhile, expect
+            # the next one an interval later.
+            if _next_heartbeat_at - _lead_s <= time.monotonic():
+                _next_heartbeat_at += _interval_s
+
+
+def mark_heartbeat() -> None:
+    """Anchor the schedule: a heartbeat is starting now."""
+    global _next_heartbeat_at
+    with _lock:
+        _next_heartbeat_at = time.monotonic() + _interval_s
+
+
+def start(interval_s: float = DEFAULT_INTERVAL_S, lead_s: float = DEFAULT_LEAD_S) -> bool:
+    """Start the background worker; returns False if it is already running."""
+    global _thread, _interval_s, _lead_s
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+        _interval_s = interval_s
+        _lead_s = min(lead_s, interval_s)
+        _stop.clear()
+        _thread = threading.Thread(target=_run, name="moltbook-prefetch", daemon=True)
+        _thread.start()
+    return True
+
+
+def stop() -> bool:
+    """Stop the background worker; returns False if it was not running."""
+    global _thread
+    with _lock:
+        thread, _thread = _thread, None
+    if thread is None or not thread.is_alive():
+        return False
+    _stop.set()
+    thread.join(timeout=5)
+    return True
+
+
+def status() -> dict:
+    with _lock:
+        running = _thread is not None and _thread.is_alive()
+        next_in = None
+        if running and _next_heartbeat_at is not None:
+            next_in = round(_next_heartbeat_at - _lead_s - time.monotonic(), 1)
+        return {
+            "running": running,
+            "interval_s": _interval_s,
+            "lead_s": _lead_s,
+            "next_warm_in_s": next_in,
+            "last_warm": _last_warm,
+        }
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode
+
+from tools.moltbook.helpers import response_cache
+
+if TYPE_CHECKING:
+    import httpx
+
+# Profile lookups. /agents/me and /agents/profile?name=... responses are kept
+# for hours by helpers/response_cache.py; update_profile and avatar call
+# invalidate_own() so our own profile is re-read after changing it. Our own
+# identity is loaded once per session and kept in session_data under
+# SESSION_KEY, where every tool can read it.
+SESSION_KEY = "moltbook_identity"
+
+# Names we have seen ourselves under in this process, so invalidate_own()
+# also drops our /agents/profile?name=... entry.
+_own_names: set[str] = set()
+
+
+def profile_path(name: str) -> str:
+    """Canonical /agents/profile path for *name* (one cache entry per molty)."""
+    return "/agents/profile?" + urlencode({"name": name.lstrip("@")})
+
+
+def _agent(data: object) -> dict:
+    if not isinstance(data, dict):
+        return {}
+    agent = data.get("agent", data)
+    return agent if isinstance(agent, dict) else {}
+
+
+def own_identity(
+    session_data: dict,
+    headers: dict[str, str],
+    client: httpx.Client | None = None,
+) -> tuple[dict | None, str | None]:
+    """Our own ``{"name", "id"}``, loaded from /agents/me once per session.
+
+    Returns ``(identity, None)`` or ``(None, error)``.
+    """
+    identity = session_data.get(SESSION_KEY)
+    if isinstance(identity, dict) and identity.get("name"):
+        return identity, None
+
+    from tools.moltbook.helpers import api
+
+    result = api.get_json(client or api.shared_client(), "/agents/me", headers, use_cache=True)
+    if result["error"]:
+        return None, result["error"]
+    agent = _agent(result["data"])
+    if not agent.get("name"):
+        return None, "/agents/me returned no name"
+
+    identity = {"name": agent["name"], "id": agent.get("id")}
+    session_data[SESSION_KEY] = identity
+    _own_names.add(agent["name"])
+    return identity, None
+
+
+def get_profiles(
+    client: httpx.Client,
+    headers: dict[str, str],
+    names: list[str],
+) -> dict[str, dict]:
+    """{name: get_json result} for each molty, served from cache where fresh."""
+    from tools.moltbook.helpers import api
+
+    paths = {name: profile_path(name) for name in names}
+    results = api.fetch_many(client, list(paths.values()), headers, use_cache=True)
+    return {name: results[path] for name, path in paths.items()}
+
+
+def profile_summary(result: dict, fields: tuple[str, ...]) -> dict:
+    """The given *fields* of the agent in a profile result, skipping missing ones."""
+    agent = _agent(result["data"])
+    return {field: agent[field] for field in fields if agent.get(field) is not None}
+
+
+def invalidate_own(session_data: dict | None = None) -> None:
+    """Drop our cached profile after changing it (update_profile, avatar).
+
+    The session identity is kept: name and ID do not change. When this
+    process has not resolved our name yet, every cached profile is dropped,
+    since any of them may be ours.
+    """
+    names = set(_own_names)
+    identity = (session_data or {}).get(SESSION_KEY)
+    if isinstance(identity, dict) and identity.get("name"):
+        names.add(identity["name"])
+    response_cache.invalidate("/agents/me")
+    if not names:
+        response_cache.invalidate("/agents/profile?", prefix=True)
+    for name in names:
+        response_cache.invalidate(profile_path(name))
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from src.utils.log import log
+from tools.moltbook.helpers.local_state import state_dir
+
+# Cache of GET results, filled by every GET made through helpers/api.py and
+# warmed ahead of heartbeats by helpers/prefetch.py. Only paths matching a
+# rule below are cached: (pattern, how old in seconds an entry may be and
+# still be served instead of the network, whether any successful mutation
+# drops it). Profiles change slowly and barely with our own actions, so
+# they are kept for hours and survive mutations; update_profile and avatar
+# invalidate ours explicitly (see helpers/profiles.py).
+_RULES: tuple[tuple[re.Pattern, float, bool], ...] = (
+    (re.compile(r"^/home(\?|$)"), 180, True),
+    (re.compile(r"^/feed(\?|$)"), 180, True),
+    (re.compile(r"^/agents/dm/check(\?|$)"), 180, True),
+    (re.compile(r"^/posts/[^/?]+/comments(\?|$)"), 180, True),
+    (re.compile(r"^/submolts(/[^/?]+)?(\?|$)"), 3600, True),
+    (re.compile(r"^/agents/me(\?|$)"), 6 * 3600, False),
+    (re.compile(r"^/agents/profile\?"), 6 * 3600, False),
+)
+
+# Entries live in two tiers: a dict in this process, and an SQLite file in
+# the local state directory that survives restarts and is shared by every
+# session on the host. Bodies are stored zlib-compressed; once the file's
+# bodies exceed the byte cap, least recently used entries are evicted.
+# Override the cap with MOLTBOOK_CACHE_MAX_BYTES. The in-memory tier keeps at
+# most MAX_MEMORY_ENTRIES parsed responses, least recently used dropped
+# first (they stay on disk), and drops an entry once it is too old to
+# serve; override with MOLTBOOK_CACHE_MAX_ENTRIES.
+DB_NAME = "response_cache.sqlite3"
+MAX_BYTES = int(os.environ.get("MOLTBOOK_CACHE_MAX_BYTES") or 32 * 1024 * 1024)
+MAX_MEMORY_ENTRIES = int(os.environ.get("MOLTBOOK_CACHE_MAX_ENTRIES") or 256)
+_COMPRESS_LEVEL = 6
+
+_lock = threading.Lock()
+_entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_db: sqlite3.Connection | None = None
+_db_failed = False
+
+
+def cache_key(path: str) -> str:
+    """Canonical key for an API *path*: exactly one leading slash."""
+    return "/" + path.lstrip("/")
+
+
+def _rule_for(path: str) -> tuple[float, bool] | None:
+    key = cache_key(path)
+    for pattern, max_age, volatile in _RULES:
+        if pattern.match(key):
+            return max_age, volatile
+    return None
+
+
+def max_age_for(path: str) -> float | None:
+    """How long a response for *path* stays servable, or None if never cached."""
+    rule = _rule_for(path)
+    return rule[0] if rule else None
+
+
+def _key_path(key: str) -> str:
+    # Keys are "<scope>:<path>" (see api.get_json) or a bare path.
+    return key.split(":", 1)[1] if ":" in key.split("/", 1)[0] else key
+
+
+def _is_volatile(key: str) -> bool:
+    rule = _rule_for(_key_path(key))
+    return rule is None or rule[1]
+
+
+def _connect() -> sqlite3.Connection | None:
+    """Open (once) the on-disk store; None if it cannot be used. Needs _lock."""
+    global _db, _db_failed
+    if _db is not None or _db_failed:
+        return _db
+    try:
+        db = sqlite3.connect(
+            os.path.join(state_dir(), DB_NAME),
+            timeout=5,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " stored_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " body BLOB NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+    except (OSError, sqlite3.Error) as e:
+        log(f"response_cache: on-disk store unavailable, using memory only: {e}")
+        _db_failed = True
+        return None
+    _db = db
+    return _db
+
+
+def _remember(key: str, entry: tuple[float, dict]) -> None:
+    """Put *entry* in the memory tier as most recently used. Needs _lock."""
+    _entries[key] = entry
+    _entries.move_to_end(key)
+    while len(_entries) > MAX_MEMORY_ENTRIES:
+        _entries.popitem(last=False)
+
+
+def _disk_get(key: str, max_age: float) -> tuple[float, dict] | None:
+    db = _connect()
+    if db is None:
+        return None
+    now = time.time()
+    try:
+        row = db.execute(
+            "SELECT stored_at, body FROM responses WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        if row is None:
+            return None
+        db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        result = json.loads(zlib.decompress(row[1]))
+    except (sqlite3.Error, zlib.error, ValueError) as e:
+        log(f"response_cache: could not read {key!r}: {e}")
+        return None
+    if now - row[0] > max_age:
+        return None
+    return row[0], result
+
+
+def _disk_put(key: str, stored_at: float, max_age: float, result: dict) -> None:
+    db = _connect()
+    if db is None:
+        return
+    try:
+        body = zlib.compress(json.dumps(result).encode("utf-8"), _COMPRESS_LEVEL)
+        db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (key, stored_at, stored_at + max_age, stored_at, len(body), body),
+        )
+        _evict(db)
+    except (sqlite3.Error, TypeError, ValueError) as e:
+        log(f"response_cache: could not store {key!r}: {e}")
+
+
+def _evict(db: sqlite3.Connection) -> None:
+    """Drop expired entries, then least recently used ones until under MAX_BYTES."""
+    db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+    (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+    if total <= MAX_BYTES:
+        return
+    excess = total - MAX_BYTES
+    victims: list[str] = []
+    for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_used"):
+        victims.append(key)
+        excess -= size
+        if excess <= 0:
+            break
+    db.executemany("DELETE FROM responses WHERE key = ?", [(k,) for k in victims])
+    log(f"response_cache: evicted {len(victims)} entries to stay under {MAX_BYTES} bytes")
+
+
+def get(path: str, scope: str = "") -> dict | None:
+    """Cached result for *path* if one exists and is still fresh.
+
+    *scope* separates entries of different accounts (see api.get_json).
+    """
+    max_age = max_age_for(path)
+    if max_age is None:
+        return None
+    key = scope + cache_key(path)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and time.time() - entry[0] > max_age:
+            del _entries[key]
+            entry = None
+        if entry is None:
+            entry = _disk_get(key, max_age)
+        if entry is not None:
+            _remember(key, entry)
+    if entry is None:
+        return None
+    return entry[1]
+
+
+def put(path: str, result: dict, scope: str = "") -> None:
+    """Store a successful *result* for *path* if the path is cacheable."""
+    max_age = max_age_for(path)
+    if result.get("error") or max_age is None:
+        return
+    key = scope + cache_key(path)
+    stored_at = time.time()
+    with _lock:
+        _remember(key, (stored_at, result))
+        _disk_put(key, stored_at, max_age, result)
+
+
+def clear() -> None:
+    """Drop every entry a mutation may have made stale, in memory and on disk.
+
+    Called after any successful mutation.
+    """
+    with _lock:
+        for key in [k for k in _entries if _is_volatile(k)]:
+            del _entries[key]
+        db = _connect()
+        if db is None:
+            return
+        try:
+            keys = [row[0] for row in db.execute("SELECT key FROM responses")]
+            db.executemany(
+                "DELETE FROM responses WHERE key = ?",
+                [(k,) for k in keys if _is_volatile(k)],
+            )
+        except sqlite3.Error as e:
+            log(f"response_cache: could not clear the on-disk store: {e}")
+
+
+def invalidate(path: str, prefix: bool = False) -> None:
+    """Drop the entries for exactly *path* (for every account), in memory and on disk.
+
+    With *prefix*, drop every path that starts with *path* instead.
+    """
+    target = cache_key(path)
+
+    def matches(key: str) -> bool:
+        key_path = _key_path(key)
+        return key_path.startswith(target) if prefix else key_path == target
+
+    with _lock:
+        for key in [k for k in _entries if matches(k)]:
+            del _entries[key]
+        db = _connect()
+        if db is None:
+            return
+        try:
+            keys = [row[0] for row in db.execute("SELECT key FROM responses")]
+            db.executemany(
+                "DELETE FROM responses WHERE key = ?",
+                [(k,) for k in keys if matches(k)],
+            )
+        except sqlite3.Error as e:
+            log(f"response_cache: could not invalidate {target!r}: {e}")
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import re
+import time
+
+from tools.moltbook.helpers.local_state import load_state, update_state
+
+# Local directory of submolts: name -> metadata, our subscription status and
+# our role, kept in the "submolt_directory" state document. Filled from every
+# successful GET of /submolts or /submolts/NAME (see api.get_json) and
+# updated in place by the subscription, create and moderator tools, so role
+# checks and "where should this go" lookups need no network call.
+_STATE = "submolt_directory"
+
+# A full /submolts listing older than this is refreshed before lookups.
+LISTING_MAX_AGE_S = 6 * 3600
+
+ROLES = ("owner", "moderator")
+
+_LISTING_RE = re.compile(r"^/submolts/?(\?|$)")
+_DETAIL_RE = re.compile(r"^/submolts/([^/?]+)/?(\?|$)")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Metadata fields copied from API responses.
+_FIELDS = ("display_name", "description", "subscriber_count", "post_count", "allow_crypto")
+_SUBSCRIBED_KEYS = ("is_subscribed", "subscribed", "your_subscription")
+
+
+def _merge_submolt(entry: dict, submolt: dict, detail: bool) -> None:
+    for field in _FIELDS:
+        if submolt.get(field) is not None:
+            entry[field] = submolt[field]
+    for key in _SUBSCRIBED_KEYS:
+        if key in submolt:
+            entry["subscribed"] = bool(submolt[key])
+            break
+    # Only a detail response reliably carries your_role; a null there means
+    # we are a regular member.
+    if detail or "your_role" in submolt:
+        entry["your_role"] = submolt.get("your_role")
+        entry["role_checked_at"] = time.time()
+    entry["updated_at"] = time.time()
+
+
+def observe(path: str, data: object) -> None:
+    """Update the directory from a successful GET response for *path*."""
+    key = "/" + path.lstrip("/")
+    if not isinstance(data, dict):
+        return
+    if _LISTING_RE.match(key):
+        listing = data.get("submolts", data.get("data"))
+        if not isinstance(listing, list):
+            return
+
+        def _merge_listing(state: dict) -> None:
+            submolts = state.setdefault("submolts", {})
+            for item in listing:
+                if isinstance(item, dict) and item.get("name"):
+                    _merge_submolt(submolts.setdefault(str(item["name"]), {}), item, detail=False)
+            state["listed_at"] = time.time()
+
+        update_state(_STATE, _merge_listing)
+        return
+
+    match = _DETAIL_RE.match(key)
+    if match:
+        submolt = data.get("submolt") if isinstance(data.get("submolt"), dict) else data
+        merged = {**submolt, "your_role": data.get("your_role", submolt.get("your_role"))}
+        name = str(submolt.get("name") or match.group(1))
+
+        def _merge_detail(state: dict) -> None:
+            entry = state.setdefault("submolts", {}).setdefault(name, {})
+            _merge_submolt(entry, merged, detail=True)
+
+        update_state(_STATE, _merge_detail)
+
+
+def listing_is_stale() -> bool:
+    listed_at = load_state(_STATE).get("listed_at")
+    return listed_at is None or time.time() - listed_at > LISTING_MAX_AGE_S
+
+
+def get_submolt(name: str) -> dict | None:
+    """Directory entry for *name*, or None if we have never seen it."""
+    return load_state(_STATE).get("submolts", {}).get(name)
+
+
+def all_submolts() -> dict[str, dict]:
+    return load_state(_STATE).get("submolts", {})
+
+
+def role_check(tool_name: str, name: str, allowed: tuple[str, ...]) -> str | None:
+    """Refuse early if the directory knows our role in *name* is not *allowed*.
+
+    Returns a user-facing error, or None when the action may proceed —
+    including when our role has never been checked, so the server decides.
+    """
+    entry = get_submolt(name)
+    if not entry or "role_checked_at" not in entry:
+        return None
+    role = entry.get("your_role")
+    if role in allowed:
+        return None
+    return (
+        f"{tool_name}: your role in m/{name} is {role or 'member'!r}, but this needs "
+        f"{' or '.join(allowed)}. If that changed recently, refresh it with "
+        f"get_data('/submolts/{name}', bypass_cache=true)."
+    )
+
+
+def set_subscribed(name: str, subscribed: bool) -> None:
+    def _set(state: dict) -> None:
+        entry = state.setdefault("submolts", {}).setdefault(name, {})
+        count = entry.get("subscriber_count")
+        if isinstance(count, int) and entry.get("subscribed") != subscribed:
+            entry["subscriber_count"] = max(count + (1 if subscribed else -1), 0)
+        entry["subscribed"] = subscribed
+        entry["updated_at"] = time.time()
+
+    update_state(_STATE, _set)
+
+
+def record_created(name: str, display_name: str, description: str | None) -> None:
+    """A submolt we just created: we own it and are subscribed."""
+    def _set(state: dict) -> None:
+        entry = state.setdefault("submolts", {}).setdefault(name, {})
+        _merge_submolt(
+            entry,
+            {
+                "display_name": display_name,
+                "description": description,
+                "subscribed": True,
+                "your_role": "owner",
+            },
+            detail=True,
+        )
+
+    update_state(_STATE, _set)
+
+
+def record_moderator_change(name: str, agent_name: str, added: bool) -> None:
+    def _set(state: dict) -> None:
+        entry = state.setdefault("submolts", {}).setdefault(name, {})
+        moderators = set(entry.get("moderators", []))
+        if added:
+            moderators.add(agent_name)
+        else:
+            moderators.discard(agent_name)
+        entry["moderators"] = sorted(moderators)
+        entry["updated_at"] = time.time()
+
+    update_state(_STATE, _set)
+
+
+def rank_for_text(text: str, limit: int | None = None) -> list[tuple[str, int]]:
+    """Submolts whose name, display name or description share words with *text*.
+
+    Returns ``[(name, shared word count), ...]`` best first, subscribed
+    submolts winning ties.
+    """
+    words = set(_WORD_RE.findall(text.lower()))
+    scored: list[tuple[int, bool, str]] = []
+    for name, entry in all_submolts().items():
+        haystack = " ".join(
+            [name.replace("-", " ")]
+            + [str(entry.get(field) or "") for field in ("display_name", "description")]
+        )
+        shared = len(words & set(_WORD_RE.findall(haystack.lower())))
+        if shared:
+            scored.append((shared, bool(entry.get("subscribed")), name))
+    scored.sort(reverse=True)
+    return [(name, shared) for shared, _, name in scored[:limit]]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+from typing import TYPE_CHECKING
+
+from tools.moltbook.helpers.local_state import load_state, update_state
+
+if TYPE_CHECKING:
+    import httpx
+
+ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+# Content hash of the last source file uploaded per target, e.g.
+# "agent:avatar" or "submolt:aithoughts:banner".
+_UPLOADS_STATE = "upload_hashes"
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def file_sha256(filepath: str) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def last_upload_hash(target: str) -> str | None:
+    """Hash recorded by the last successful upload to *target*, if any."""
+    return load_state(_UPLOADS_STATE).get(target)
+
+
+def record_upload(target: str, digest: str | None) -> None:
+    """Remember *digest* as the current image of *target*; None forgets it."""
+
+    def _apply(hashes: dict) -> None:
+        if digest is None:
+            hashes.pop(target, None)
+        else:
+            hashes[target] = digest
+
+    update_state(_UPLOADS_STATE, _apply)
+
+
+def check_image(
+    tool_name: str, filepath: str, max_bytes: int, limit_label: str
+) -> str | None:
+    """Cheap pre-flight format and size check; returns an error message or None."""
+    content_type, _ = mimetypes.guess_type(filepath)
+    if content_type not in ALLOWED_IMAGE_TYPES:
+        return (
+            f"{tool_name}: unsupported file format ({content_type!r}). "
+            "Use JPEG, PNG, GIF, or WebP."
+        )
+    try:
+        size = os.path.getsize(filepath)
+    except OSError as e:
+        return f"{tool_name}: could not stat file: {e}"
+    if size > max_bytes:
+        return f"{tool_name}: file is {size} bytes, exceeds the {limit_label} limit."
+    return None
+
+
+def upload_image(
+    tool_name: str,
+    url: str,
+    filepath: str,
+    headers: dict[str, str],
+    max_bytes: int,
+    limit_label: str,
+) -> tuple[httpx.Response | None, str | None]:
+    """Validate an image and stream it to *url* as a multipart ``file`` field.
+
+    The open file handle is passed straight to httpx, which reads it in
+    chunks while sending — the image is never held in memory in full.
+
+    Returns ``(response, None)`` once the request completed, or
+    ``(None, message)`` with a user-facing error prefixed by *tool_name*.
+    """
+    import httpx
+
+    error = check_image(tool_name, filepath, max_bytes, limit_label)
+    if error:
+        return None, error
+    content_type, _ = mimetypes.guess_type(filepath)
+
+    # Multipart upload — do NOT include Content-Type: application/json;
+    # httpx sets the correct multipart boundary header automatically.
+    upload_headers = {k: v for k, v in headers.items() if k.lower() != "content-type"}
+    filename = os.path.basename(filepath)
+
+    try:
+        f = open(filepath, "rb")
+    except OSError as e:
+        return None, f"{tool_name}: could not read file: {e}"
+
+    with f:
+        # Re-check the size on the handle that will actually be sent.
+        size = os.fstat(f.fileno()).st_size
+        if size > max_bytes:
+            return None, f"{tool_name}: file is {size} bytes, exceeds the {limit_label} limit."
+
+        try:
+            resp = httpx.post(
+                url,
+                files={"file": (filename, f, content_type)},
+                headers=upload_headers,
+                timeout=30,
+                follow_redirects=True,
+            )
+        except Exception as e:
+            return None, f"{tool_name}: HTTP error during upload: {e}"
+
+    return resp, None
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import re
+from urllib.parse import parse_qsl, urlsplit
+
+# Pre-flight argument checks, run at the top of every tool's execute() so a
+# bad call fails before any token load, database query, HTTP request or
+# verification solve. Per-argument constraints come from the tool's own
+# DEFINITION (type, enum, required, additionalProperties and the JSON-schema
+# keywords minLength / maxLength / pattern / minimum / maximum / minItems /
+# maxItems / items). Rules spanning several arguments, and limits the API
+# enforces on query strings, are declared in _RULES below; their sources are
+# the skill files.
+
+_RULES: dict[str, list[dict]] = {
+    "vote": [
+        {
+            "when": {"target": "comment"},
+            "forbid": {"direction": "down"},
+            "error": "downvoting is not supported for comments.",
+        },
+    ],
+    "dm_request": [
+        {"exactly_one_of": ("to", "to_owner")},
+    ],
+    "update_profile": [
+        {"at_least_one_of": ("description", "metadata")},
+    ],
+    "update_submolt_settings": [
+        {"at_least_one_of": ("description", "banner_color", "theme_color")},
+    ],
+    "get_data": [
+        # search.txt: q is required and at most 500 chars; limit is at most 50.
+        {
+            "path_prefix": "/search",
+            "query": {
+                "q": {"type": "string", "minLength": 1, "maxLength": 500},
+                "type": {"type": "string", "enum": ["posts", "comments", "all"]},
+                "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+            },
+            "required_query": ("q",),
+        },
+    ],
+}
+
+_JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+}
+
+_compiled: dict[str, tuple[dict, list[dict]]] = {}
+
+
+def _compile(definition: dict) -> tuple[dict, list[dict]]:
+    """Parameters schema (patterns precompiled) and rules for one tool; cached."""
+    function = definition["function"]
+    name = function["name"]
+    if name not in _compiled:
+        params = dict(function.get("parameters") or {})
+        params["_patterns"] = {
+            key: re.compile(prop["pattern"])
+            for key, prop in (params.get("properties") or {}).items()
+            if "pattern" in prop
+        }
+        _compiled[name] = (params, _RULES.get(name, []))
+    return _compiled[name]
+
+
+def _type_ok(value: object, expected: str | None) -> bool:
+    if expected is None or expected not in _JSON_TYPES:
+        return True
+    if isinstance(value, bool) and expected != "boolean":
+        return False
+    if expected == "integer" and isinstance(value, float):
+        return value.is_integer()
+    return isinstance(value, _JSON_TYPES[expected])
+
+
+def _check_value(key: str, value: object, prop: dict, pattern: re.Pattern | None) -> str | None:
+    expected = prop.get("type")
+    if not _type_ok(value, expected):
+        return f"'{key}' must be of type {expected}."
+    if "enum" in prop and value not in prop["enum"]:
+        return f"'{key}' must be one of {', '.join(repr(v) for v in prop['enum'])}."
+    if isinstance(value, str):
+        if len(value) < prop.get("minLength", 0):
+            return f"'{key}' must be at least {prop['minLength']} characters."
+        if "maxLength" in prop and len(value) > prop["maxLength"]:
+            return f"'{key}' must be at most {prop['maxLength']} characters (got {len(value)})."
+        if pattern is not None and not pattern.fullmatch(value):
+            return f"'{key}' must match {pattern.pattern}."
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in prop and value < prop["minimum"]:
+            return f"'{key}' must be at least {prop['minimum']}."
+        if "maximum" in prop and value > prop["maximum"]:
+            return f"'{key}' must be at most {prop['maximum']}."
+    elif isinstance(value, list):
+        if len(value) < prop.get("minItems", 0):
+            return f"'{key}' must contain at least {prop['minItems']} item(s)."
+        if "maxItems" in prop and len(value) > prop["maxItems"]:
+            return f"'{key}' must contain at most {prop['maxItems']} items."
+        items = prop.get("items")
+        if items:
+            item_pattern = re.compile(items["pattern"]) if "pattern" in items else None
+            for i, item in enumerate(value):
+                error = _check_value(f"{key}[{i}]", item, items, item_pattern)
+                if error:
+                    return error
+    return None
+
+
+def _check_query(path: str, rule: dict) -> str | None:
+    parts = urlsplit(path)
+    if not ("/" + parts.path.lstrip("/")).startswith(rule["path_prefix"]):
+        return None
+    query = dict(parse_qsl(parts.query))
+    for key in rule.get("required_query", ()):
+        if not query.get(key):
+            return f"{rule['path_prefix']} requires the '{key}' query parameter."
+    for key, prop in rule["query"].items():
+        if key not in query:
+            continue
+        value: object = query[key]
+        if prop.get("type") == "integer":
+            try:
+                value = int(value)
+            except ValueError:
+                return f"query parameter '{key}' must be an integer."
+        error = _check_value(key, value, prop, None)
+        if error:
+            return f"query parameter {error}"
+    return None
+
+
+def _check_rule(args: dict, rule: dict) -> str | None:
+    if "exactly_one_of" in rule:
+        keys = rule["exactly_one_of"]
+        present = [k for k in keys if args.get(k) is not None]
+        if len(present) > 1:
+            return f"provide either {' or '.join(repr(k) for k in keys)}, not both."
+        if not present:
+            return f"one of {' or '.join(repr(k) for k in keys)} is required."
+    elif "at_least_one_of" in rule:
+        keys = rule["at_least_one_of"]
+        if not any(k in args for k in keys):
+            return f"at least one of {', '.join(repr(k) for k in keys)} must be provided."
+    elif "when" in rule:
+        if all(args.get(k) == v for k, v in rule["when"].items()):
+            forbidden = rule["forbid"]
+            if all(args.get(k) == v for k, v in forbidden.items()):
+                return rule["error"]
+    elif "path_prefix" in rule and isinstance(args.get("path"), str):
+        return _check_query(args["path"], rule)
+    return None
+
+
+def validate_args(definition: dict, args: dict) -> str | None:
+    """Check *args* against the tool's DEFINITION and declared rules.
+
+    Returns a user-facing error prefixed with the tool name, or None if the
+    call may proceed.
+    """
+    params, rules = _compile(definition)
+    name = definition["function"]["name"]
+    properties = params.get("properties") or {}
+    patterns = params["_patterns"]
+
+    for key in params.get("required", ()):
+        if args.get(key) is None:
+            return f"{name}: '{key}' is required."
+    if params.get("additionalProperties") is False:
+        unknown = [key for key in args if key not in properties]
+        if unknown:
+            return f"{name}: unknown argument(s): {', '.join(repr(k) for k in unknown)}."
+    for key, value in args.items():
+        prop = properties.get(key)
+        if prop is None or value is None:
+            continue
+        error = _check_value(key, value, prop, patterns.get(key))
+        if error:
+            return f"{name}: {error}"
+    for rule in rules:
+        error = _check_rule(args, rule)
+        if error:
+            return f"{name}: {error}"
+    return None
@@ -1,79 +1,439 @@
 from __future__ import annotations
 
+import ast
 import json
+import operator
+import re
+from collections import OrderedDict, deque
 
 from src.utils.llm.streaming import StreamingLLM
 from src.utils.log import log
+from tools.moltbook.helpers.local_state import load_state, update_state
+from tools.moltbook.helpers.word_math import normalize_challenge, solve_word_problem
 
-# VERIFICATION_MODEL = "meta-llama/llama-3.2-3b-instruct"
-# VERIFICATION_MAX_TOKENS = 32
+# Small, non-thinking model used for the cheap first pass.
+FAST_VERIFICATION_MODEL = "meta-llama/llama-3.2-3b-instruct"
+FAST_VERIFICATION_MAX_TOKENS = 32
 
 # Thinking tends to be useful
 VERIFICATION_MODEL="qwen/qwen3-8b"
 VERIFICATION_MAX_TOKENS=16384
 
+# Solver tiers, cheapest first. Remove an entry to skip that tier; the
+# thinking model (VERIFICATION_MODEL) is always the final fallback.
+#   parser      — deterministic word-problem parser (helpers/word_math.py)
+#   fast_model  — FAST_VERIFICATION_MODEL asked for the answer directly
+#   cross_check — FAST_VERIFICATION_MODEL asked for the arithmetic expression,
+#                 evaluated locally, to confirm the fast_model answer
+# The thinking model is skipped only when cross_check confirms a cheap
+# answer: the parser's when it produced one, else fast_model's. A parser
+# answer that disagrees with the model tiers escalates even if they agree
+# with each other — both are the same small model reading the same text,
+# so their mistakes are correlated. Once escalated, the thinking model's
+# answer wins.
+VERIFICATION_TIERS: tuple[str, ...] = ("parser", "fast_model", "cross_check")
+
+# A well-formed final answer: the whole line is a number with 2 decimals.
+_ANSWER_RE = re.compile(r"^-?\d+\.\d{2}$")
+_NUMBER_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+_TIER_STATS_NAME = "verification_tiers"
+
+# Answers the server accepted, keyed by normalized challenge text.
+_MEMO_MAX_ENTRIES = 256
+_memo: OrderedDict[str, str] = OrderedDict()
+
+
+def remember_answer(challenge_text: str, answer: str) -> None:
+    """Memoise an answer /verify accepted for *challenge_text*."""
+    key = normalize_challenge(challenge_text)
+    _memo[key] = answer
+    _memo.move_to_end(key)
+    while len(_memo) > _MEMO_MAX_ENTRIES:
+        _memo.popitem(last=False)
+
+
+def forget_answer(challenge_text: str) -> None:
+    """Drop a memoised answer /verify rejected."""
+    _memo.pop(normalize_challenge(challenge_text), None)
+
+
+# Where the verification object usually sits in a mutation response, checked
+# before any traversal. The path that matched last time is tried first.
+_KNOWN_VERIFICATION_PATHS: tuple[tuple[str, ...], ...] = (
+    ("verification",),
+    ("post", "verification"),
+    ("comment", "verification"),
+)
+_last_verification_path: tuple[str | int, ...] | None = None
+
+# Deepest nesting level searched by the fallback breadth-first walk.
+_MAX_VERIFICATION_DEPTH = 6
+
+
+def _is_verification(candidate: object) -> bool:
+    return (
+        isinstance(candidate, dict)
+        and "verification_code" in candidate
+        and "challenge_text" in candidate
+    )
+
+
+def _follow_path(data: object, path: tuple[str | int, ...]) -> object:
+    for key in path:
+        if isinstance(data, dict):
+            data = data.get(key)
+        elif isinstance(data, list) and isinstance(key, int) and key < len(data):
+            data = data[key]
+        else:
+            return None
+    return data
+
 
 def find_verification_obj(data: object) -> dict | None:
-    """Recursively search *data* for a 'verification' key whose value is a dict
+    """Search *data* for a 'verification' key whose value is a dict
     containing at least 'verification_code' and 'challenge_text'.
 
-    Returns the first matching verification dict, or None if not found.
+    The path that matched last time and the known locations are checked
+    first; otherwise the response is walked breadth-first down to
+    _MAX_VERIFICATION_DEPTH levels. Returns the first matching verification
+    dict, or None if not found.
     """
-    if isinstance(data, dict):
-        candidate = data.get("verification")
-        if (
-            isinstance(candidate, dict)
-            and "verification_code" in candidate
-            and "challenge_text" in candidate
-        ):
+    global _last_verification_path
+
+    paths = _KNOWN_VERIFICATION_PATHS
+    if _last_verification_path is not None:
+        paths = (_last_verification_path, *paths)
+    for path in paths:
+        candidate = _follow_path(data, path)
+        if _is_verification(candidate):
+            _last_verification_path = path
             return candidate
-        for value in data.values():
-            result = find_verification_obj(value)
-            if result is not None:
-                return result
-    elif isinstance(data, list):
-        for item in data:
-            result = find_verification_obj(item)
-            if result is not None:
-                return result
+
+    queue: deque[tuple[object, tuple[str | int, ...]]] = deque([(data, ())])
+    while queue:
+        node, path = queue.popleft()
+        if isinstance(node, dict):
+            candidate = node.get("verification")
+            if _is_verification(candidate):
+                _last_verification_path = (*path, "verification")
+                return candidate
+            children = node.items()
+        elif isinstance(node, list):
+            children = enumerate(node)
+        else:
+            continue
+        if len(path) < _MAX_VERIFICATION_DEPTH:
+            for key, value in children:
+                if isinstance(value, (dict, list)):
+                    queue.append((value, (*path, key)))
     return None
 
 
-def solve_challenge(llm: StreamingLLM, challenge_text: str) -> str:
-    """Ask the LLM to decode and solve the obfuscated math problem.
+class _AnswerWatcher:
+    """Incrementally scans streamed output for a stable final answer.
 
-    Always overrides the model to VERIFICATION_MODEL and caps output at
-    VERIFICATION_MAX_TOKENS so a lightweight, non-reasoning model is used.
+    With *thinking* (the reply of a reasoning model), nothing is accepted
+    before ``</think>`` arrives, since the opening tag may be part of the
+    prompt template and never streamed; only text after the block counts.
+    Otherwise an answer is accepted only while it is the sole non-empty line,
+    so a model showing its working is never cut off at an intermediate
+    number. Either way a line is only accepted once something follows it (a
+    newline or trailing space), so a partially streamed "15.0" is never
+    mistaken for "15.00" and "15.00" is never cut short of "15.005".
     """
-    remove_chars="[]^/?\\&*!@#$%():;\'\"<>"
-    cleaned = challenge_text.lower().strip()
-    for char in remove_chars:
-        cleaned = cleaned.replace(char, "")
-    prompt = (
-        "Decode and solve the following math problem. "
-        "The text mays random capitalisation and punctuation noise "
-        "or random special characters scattered through the words). "
-        "Strip all that noise, read the plain English sentence, solve it, "
-        "and reply with ONLY the numeric answer formatted to exactly 2 decimal "
-        "places (e.g. '15.00'). No explanation, no other text.\n\n"
-        f"Problem: {challenge_text.lower()}"
-    )
-    messages = [{"role": "user", "content": prompt}]
-    result = llm.fetch(
+
+    def __init__(self, thinking: bool) -> None:
+        self.thinking = thinking
+        self.text = ""
+
+    def _visible(self) -> str | None:
+        if "</think>" in self.text:
+            return self.text.rsplit("</think>", 1)[1]
+        if self.thinking or "<think>" in self.text:
+            # Still reasoning.
+            return None
+        return self.text
+
+    def feed(self, delta: str) -> str | None:
+        """Add *delta* and return the answer once it is stable, else None."""
+        self.text += delta
+        visible = self._visible()
+        if visible is None:
+            return None
+        lines = visible.split("\n")
+        if not self.thinking:
+            if sum(bool(line.strip()) for line in lines) != 1:
+                return None
+        for line in lines[:-1]:
+            if _ANSWER_RE.match(line.strip()):
+                return line.strip()
+        last = lines[-1]
+        if last != last.rstrip() and _ANSWER_RE.match(last.strip()):
+            return last.strip()
+        return None
+
+    def final(self) -> str:
+        """Best answer once the stream has ended."""
+        if "</think>" in self.text:
+            visible = self.text.rsplit("</think>", 1)[1]
+        elif "<think>" in self.text:
+            # Reasoning never closed — nothing usable after it.
+            return ""
+        else:
+            # Reasoning reported separately (or not at all): all content counts.
+            visible = self.text
+        for line in reversed(visible.split("\n")):
+            if _ANSWER_RE.match(line.strip()):
+                return line.strip()
+        return visible.strip()
+
+
+def _chunk_content(chunk: object) -> str:
+    """Extract the answer-text delta from one streamed chunk.
+
+    Separately reported reasoning deltas are ignored — only the visible
+    content can hold the final answer.
+    """
+    if isinstance(chunk, str):
+        return chunk
+    if isinstance(chunk, dict):
+        return chunk.get("content") or ""
+    return getattr(chunk, "content", None) or ""
+
+
+# Set once the missing-stream() fallback has been logged.
+_warned_no_stream = False
+
+
+def _stream_answer(llm: StreamingLLM, messages: list[dict]) -> str:
+    """Stream the verification completion and stop as soon as the answer is stable.
+
+    Only ``StreamingLLM.fetch`` is relied on elsewhere in these tools. A
+    ``stream`` method (same arguments, yielding content deltas as str, dicts
+    or objects with ``content``, cancelled by closing the generator) is used
+    when the installed slbp provides one; otherwise this falls back to a
+    blocking ``fetch``, which disables the early stop and is logged once per
+    process.
+    """
+    global _warned_no_stream
+    stream = getattr(llm, "stream", None)
+    if stream is None:
+        if not _warned_no_stream:
+            _warned_no_stream = True
+            log(
+                f"solve_challenge: {type(llm).__name__} has no stream() method; "
+                "using blocking fetch(), so answers cannot be taken early."
+            )
+        result = llm.fetch(
+            messages,
+            max_tokens=VERIFICATION_MAX_TOKENS,
+            parameters={"model": VERIFICATION_MODEL},
+        )
+        watcher = _AnswerWatcher(thinking=True)
+        watcher.feed(result.content or "")
+        return watcher.final()
+
+    watcher = _AnswerWatcher(thinking=True)
+    chunks = stream(
         messages,
         max_tokens=VERIFICATION_MAX_TOKENS,
         parameters={"model": VERIFICATION_MODEL},
     )
+    try:
+        for chunk in chunks:
+            answer = watcher.feed(_chunk_content(chunk))
+            if answer is not None:
+                log(f"solve_challenge: stable answer {answer!r}, cancelling stream.")
+                return answer
+    finally:
+        # Closing the generator aborts the underlying HTTP stream.
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    return watcher.final()
+
+
+def _format_number(text: str) -> str | None:
+    """Normalise a bare numeric reply to 2 decimals; None if it is not one."""
+    text = text.strip().rstrip(".")
+    if not _NUMBER_RE.match(text):
+        return None
+    return f"{float(text):.2f}"
+
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+def _eval_expression(text: str) -> str | None:
+    """Safely evaluate a plain arithmetic expression; None if it is not one."""
+    try:
+        tree = ast.parse(text.strip().rstrip("="), mode="eval")
+    except SyntaxError:
+        return None
+
+    def _eval(node: ast.AST) -> float:
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return float(node.value)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -_eval(node.operand)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+            return _BIN_OPS[type(node.op)](_eval(node.left), _eval(node.right))
+        raise ValueError("unsupported expression")
+
+    try:
+        return f"{_eval(tree.body):.2f}"
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _problem_text(raw: str, problem: str) -> str:
+    """Both forms of a challenge for a model prompt: the cleanup can be lossy."""
+    return f"Original (noisy): {raw}\nCleaned up: {problem}"
+
+
+def _ask_fast_model(llm: StreamingLLM, instruction: str, problem_text: str) -> str:
+    messages = [{"role": "user", "content": f"{instruction}\n\n{problem_text}"}]
+    try:
+        result = llm.fetch(
+            messages,
+            max_tokens=FAST_VERIFICATION_MAX_TOKENS,
+            parameters={"model": FAST_VERIFICATION_MODEL},
+        )
+    except Exception as e:
+        log(f"solve_challenge: fast model call failed: {e}")
+        return ""
+    return (result.content or "").strip()
+
+
+def _record_tiers(answered: list[str], resolved_by: str) -> None:
+    def _apply(stats: dict) -> None:
+        stats["challenges"] = stats.get("challenges", 0) + 1
+        tiers = stats.setdefault("answered", {})
+        for tier in answered:
+            tiers[tier] = tiers.get(tier, 0) + 1
+        resolved = stats.setdefault("resolved_by", {})
+        resolved[resolved_by] = resolved.get(resolved_by, 0) + 1
+
+    update_state(_TIER_STATS_NAME, _apply)
+
+
+def get_tier_stats() -> dict:
+    """Per-tier counts and hit rates for tuning cost against latency.
+
+    ``answered`` counts how often a tier produced a parseable answer;
+    ``resolved_by`` counts which step settled the challenge
+    ("parser_cross_check", "cross_check", "parser_confirmed" when the
+    thinking model gave the parser's answer, or "thinking_model"). Rates are
+    fractions of all challenges.
+    """
+    stats = load_state(_TIER_STATS_NAME)
+    total = stats.get("challenges", 0)
+    rates = {
+        name: (count / total if total else 0.0)
+        for name, count in stats.get("resolved_by", {}).items()
+    }
+    return {**stats, "hit_rates": rates}
+
+
+def _solve_with_tiers(
+    llm: StreamingLLM, raw: str, problem: str
+) -> tuple[str | None, dict[str, str], str]:
+    """Run the cheap tiers. Returns (answer or None, answers by tier, resolver).
+
+    An answer is returned only when cross_check confirms it: the parser's
+    if it produced one (resolver "parser_cross_check"), else fast_model's
+    ("cross_check").
+    """
+    answers: dict[str, str] = {}
+    if "parser" in VERIFICATION_TIERS:
+        parsed = solve_word_problem(problem)
+        if parsed is not None:
+            answers["parser"] = parsed
+    if "fast_model" in VERIFICATION_TIERS:
+        fast = _format_number(_ask_fast_model(
+            llm,
+            "Decode and solve this noisy math word problem. Reply with ONLY the "
+            "numeric answer formatted to 2 decimal places (e.g. '15.00').",
+            _problem_text(raw, problem),
+        ))
+        if fast is not None:
+            answers["fast_model"] = fast
+
+    parsed = answers.get("parser")
+    candidate = parsed if parsed is not None else answers.get("fast_model")
+    if candidate is not None and "cross_check" in VERIFICATION_TIERS:
+        expression = _eval_expression(_ask_fast_model(
+            llm,
+            "Decode this noisy math word problem and reply with ONLY the arithmetic "
+            "expression that solves it, using digits and + - * / (e.g. '20 - 5').",
+            _problem_text(raw, problem),
+        ))
+        if expression is not None:
+            answers["cross_check"] = expression
+            if expression == candidate:
+                resolver = "cross_check" if parsed is None else "parser_cross_check"
+                return expression, answers, resolver
+    log(f"solve_challenge: no confirmed cheap answer ({answers!r}), escalating.")
+    return None, answers, "thinking_model"
+
+
+def solve_challenge(llm: StreamingLLM, challenge_text: str) -> str:
+    """Decode and solve the obfuscated math problem.
+
+    Tries the cheap tiers in VERIFICATION_TIERS first and accepts an answer
+    only when cross_check confirms it (the parser's when there is one, else
+    fast_model's). Otherwise escalates to VERIFICATION_MODEL, capped at
+    VERIFICATION_MAX_TOKENS; that completion is streamed and cancelled as soon
+    as a well-formed answer follows the reasoning block.
+    """
+    problem = normalize_challenge(challenge_text)
+
+    memoised = _memo.get(problem)
+    if memoised is not None:
+        log(f"solve_challenge: memoised answer {memoised!r} for {problem!r}")
+        return memoised
+
+    answer, answers, resolved_by = _solve_with_tiers(llm, challenge_text.lower(), problem)
+    answered = list(answers)
+    if answer is not None:
+        _record_tiers(answered, resolved_by)
+        log(f"solve_challenge: {resolved_by} answered {answer!r} for {problem!r}")
+        return answer
+
+    prompt = (
+        "Solve the following math word problem. It is given as the noisy "
+        "original and as a cleaned-up version; the cleanup may have dropped or "
+        "misread something, so check it against the original. Reply with ONLY "
+        "the numeric answer formatted to exactly 2 decimal places (e.g. "
+        "'15.00'). No explanation, no other text.\n\n"
+        f"{_problem_text(challenge_text.lower(), problem)}"
+    )
+    messages = [{"role": "user", "content": prompt}]
+    answer = _stream_answer(llm, messages)
     log(f"""
 Messages:
 
 {json.dumps(messages, indent=2)}
 
 
-Result:
-{result}
+Answer:
+{answer}
 
 """)
-    if not result.content.strip():
+    if not answer:
         raise ValueError("Empty answer from LLM for math challenge.")
-    return result.content.strip()
+    if _ANSWER_RE.match(answer):
+        answered.append("thinking_model")
+    parsed = answers.get("parser")
+    if parsed == answer:
+        resolved_by = "parser_confirmed"
+    elif parsed is not None:
+        log(f"solve_challenge: thinking model answered {answer!r}, overriding parser's {parsed!r}.")
+    _record_tiers(answered, resolved_by)
+    return answer
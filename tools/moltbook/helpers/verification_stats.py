@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from tools.moltbook.helpers.local_state import load_state, update_state
+
+# Learned behaviour of the Moltbook /verify endpoint, persisted between
+# sessions so every mutation benefits from what earlier ones observed.
+_STATE_NAME = "verification_stats"
+
+# Weight of the newest sample in the solve-time moving average.
+_SOLVE_TIME_ALPHA = 0.3
+
+# Safety factor applied to the average solve time when deciding whether a
+# code still has enough lifetime left to be worth solving.
+SOLVE_TIME_MARGIN = 1.5
+
+
+def record_solve_time(seconds: float) -> None:
+    """Fold one challenge solve duration into the moving average."""
+
+    def _apply(stats: dict) -> None:
+        previous = stats.get("solve_time_avg_s")
+        if previous is None:
+            stats["solve_time_avg_s"] = seconds
+        else:
+            stats["solve_time_avg_s"] = (
+                _SOLVE_TIME_ALPHA * seconds + (1 - _SOLVE_TIME_ALPHA) * previous
+            )
+        stats["solves"] = stats.get("solves", 0) + 1
+
+    update_state(_STATE_NAME, _apply)
+
+
+def record_code_age(age_s: float, expired: bool) -> None:
+    """Record the age of a code when /verify answered.
+
+    ``expired`` is True for a 410. The shortest age ever seen to expire and the
+    longest age ever seen to still be accepted bracket the code lifetime.
+    """
+
+    def _apply(stats: dict) -> None:
+        if expired:
+            stats["expired"] = stats.get("expired", 0) + 1
+            shortest = stats.get("min_expired_age_s")
+            if shortest is None or age_s < shortest:
+                stats["min_expired_age_s"] = age_s
+        else:
+            longest = stats.get("max_live_age_s")
+            if longest is None or age_s > longest:
+                stats["max_live_age_s"] = age_s
+        # A live code older than the shortest expiry means the server's
+        # lifetime changed — forget the stale bound.
+        shortest = stats.get("min_expired_age_s")
+        longest = stats.get("max_live_age_s")
+        if shortest is not None and longest is not None and longest > shortest:
+            stats.pop("min_expired_age_s", None)
+
+    update_state(_STATE_NAME, _apply)
+
+
+def record_outcome(success: bool) -> None:
+    """Count one /verify verdict (correct or incorrect answer)."""
+
+    def _apply(stats: dict) -> None:
+        key = "successes" if success else "wrong_answers"
+        stats[key] = stats.get(key, 0) + 1
+
+    update_state(_STATE_NAME, _apply)
+
+
+def record_wrong_answer_consumes(consumed: bool) -> None:
+    """Record whether re-verifying a code after a wrong answer returned 409."""
+
+    def _apply(stats: dict) -> None:
+        stats["wrong_answer_consumes"] = consumed
+
+    update_state(_STATE_NAME, _apply)
+
+
+def estimated_code_lifetime() -> float | None:
+    """Best known code lifetime in seconds, or None if no code has expired yet."""
+    return load_state(_STATE_NAME).get("min_expired_age_s")
+
+
+def expected_solve_time() -> float | None:
+    """Average solve time scaled by SOLVE_TIME_MARGIN, or None if unknown."""
+    average = load_state(_STATE_NAME).get("solve_time_avg_s")
+    if average is None:
+        return None
+    return average * SOLVE_TIME_MARGIN
+
+
+def wrong_answer_consumes() -> bool | None:
+    """Whether a wrong answer burns the code: True, False, or None if unknown."""
+    return load_state(_STATE_NAME).get("wrong_answer_consumes")
+
+
+def get_stats() -> dict:
+    """Return a copy of everything learned so far."""
+    return dict(load_state(_STATE_NAME))
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# Deterministic solver for the simple "two numbers, one operation" word
+# problems Moltbook uses as verification challenges, e.g.
+# "a lobster swims at twenty meters and slows by five" -> 15.00.
+
+_UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11,
+    "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15,
+    "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+_TENS = {
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+_SCALES = {"hundred": 100, "thousand": 1000}
+
+_OPERATORS = {
+    "+": (
+        "plus", "add", "adds", "added", "gain", "gains", "gained", "increase",
+        "increases", "increased", "more", "total", "sum", "combined",
+        "accelerates", "speeds",
+    ),
+    "-": (
+        "minus", "subtract", "subtracts", "subtracted", "lose", "loses",
+        "lost", "slow", "slows", "slowed", "decrease", "decreases",
+        "decreased", "less", "fewer", "drops", "reduces", "reduced",
+        "remain", "remaining", "left",
+    ),
+    "*": ("times", "multiplied", "multiplies", "multiply", "product"),
+    "/": ("divided", "divides", "divide", "split", "splits", "shared"),
+}
+
+_WORD_RE = re.compile(r"[a-z]+|\d+(?:\.\d+)?")
+_REPEAT_RE = re.compile(r"(.)\1+")
+
+# An arithmetic symbol standing between digits or whitespace ("20 + 5",
+# "20-5") is an operation and becomes its word before noise is stripped.
+_SYMBOL_WORDS = {"+": "plus", "-": "minus", "*": "times", "×": "times", "/": "divided", "÷": "divided"}
+_ARITHMETIC_RE = re.compile(r"(?<![^\s\d])[-+*/×÷](?![^\s\d])")
+
+# Other noise scattered inside words is deleted outright ("S[wImS" ->
+# "swims"). A hyphen inside a word is noise too ("lO^bSt-Er" -> "lobster",
+# "thirty-two" -> "thirtytwo", split again by canonical_words); any other
+# hyphen or comma separates words ("5-meter" -> "5 meter").
+_NOISE_CHARS = "[]^/?\\&*!@#$%():;'\"<>`~|{}_=+×÷"
+_SEPARATOR_CHARS = ","
+_NORMALIZE_TABLE = str.maketrans(
+    _SEPARATOR_CHARS, " " * len(_SEPARATOR_CHARS), _NOISE_CHARS
+)
+_INNER_HYPHEN_RE = re.compile(r"(?<=[a-z])-+(?=[a-z])")
+
+
+@lru_cache(maxsize=4096)
+def _collapse(word: str) -> str:
+    """Collapse runs of a repeated letter: 'twennty' -> 'twenty', 'three' -> 'thre'."""
+    return _REPEAT_RE.sub(r"\1", word)
+
+
+# Vocabulary keyed by collapsed spelling so doubled letters still match.
+_VOCAB: dict[str, str] = {
+    _collapse(w): w
+    for w in (*_UNITS, *_TENS, *_SCALES, *(k for ks in _OPERATORS.values() for k in ks))
+}
+_OPERATOR_OF: dict[str, str] = {w: op for op, ws in _OPERATORS.items() for w in ws}
+
+# Longest run of fragments that may be re-joined into one word.
+_MAX_SPLIT = 3
+
+
+def _split_compound(token: str) -> list[str] | None:
+    """'thirtytwo' -> ['thirty', 'two'], or None if *token* is not tens + unit."""
+    collapsed = _collapse(token)
+    for tens in _TENS:
+        head = _collapse(tens)
+        if collapsed.startswith(head) and _VOCAB.get(collapsed[len(head):]) in _UNITS:
+            return [tens, _VOCAB[collapsed[len(head):]]]
+    return None
+
+
+def canonical_words(text: str) -> list[str]:
+    """Tokenise *text*, repairing doubled letters and words split by noise.
+
+    Known number and operator words come back in their canonical spelling;
+    everything else is returned unchanged.
+    """
+    tokens = _WORD_RE.findall(text.lower())
+    words: list[str] = []
+    i = 0
+    while i < len(tokens):
+        for span in range(min(_MAX_SPLIT, len(tokens) - i), 0, -1):
+            joined = _collapse("".join(tokens[i:i + span]))
+            if joined in _VOCAB:
+                words.append(_VOCAB[joined])
+                i += span
+                break
+        else:
+            words.extend(_split_compound(tokens[i]) or [tokens[i]])
+            i += 1
+    return words
+
+
+def normalize_challenge(text: str) -> str:
+    """Canonical form of a challenge: noise stripped, words repaired, one space apart.
+
+    Arithmetic symbols become words first, so nothing the problem depends on
+    is dropped: "A] lO^bSt-Er sW]iMs aT tW]eNn-Tyy + fIvE" -> "a lobster
+    swims at twenty plus five". The result is the single key used for
+    solving, memoising and logging a challenge.
+    """
+    text = _ARITHMETIC_RE.sub(lambda m: f" {_SYMBOL_WORDS[m.group()]} ", text.lower())
+    text = _INNER_HYPHEN_RE.sub("", text.translate(_NORMALIZE_TABLE))
+    return " ".join(canonical_words(text.replace("-", " ")))
+
+
+def _read_numbers(words: list[str]) -> list[tuple[int, int, float]]:
+    """Numbers in *words* as (first word index, last word index, value)."""
+    numbers: list[tuple[int, int, float]] = []
+    current: int | None = None
+    start = 0
+    total = 0
+    for i, word in enumerate(words + [""]):
+        if word in _UNITS or word in _TENS:
+            if current is None:
+                start = i
+            value = _UNITS.get(word, _TENS.get(word, 0))
+            current = (current or 0) + value
+        elif word in _SCALES and current is not None:
+            scale = _SCALES[word]
+            if scale >= 1000:
+                total += current * scale
+                current = 0
+            else:
+                current *= scale
+        else:
+            if current is not None:
+                numbers.append((start, i - 1, float(total + current)))
+                current, total = None, 0
+            if word and word[0].isdigit():
+                numbers.append((i, i, float(word)))
+    return numbers
+
+
+def solve_word_problem(text: str) -> str | None:
+    """Solve *text* if it has exactly two numbers and one operation between them.
+
+    Only operator words sitting between the two numbers count, so context
+    such as "the total force is 25 times 3" reads as 25 * 3. Returns the
+    answer formatted to 2 decimal places, or None when the problem does not
+    fit that shape or more than one operation is a candidate.
+    """
+    words = canonical_words(text)
+    numbers = _read_numbers(words)
+    if len(numbers) != 2:
+        return None
+    (first_start, first_end, a), (second_start, _, b) = numbers
+    if first_start and words[first_start - 1] == "minus":
+        return None  # a leading sign, not an operation between the numbers
+    operators = {
+        _OPERATOR_OF[w] for w in words[first_end + 1:second_start] if w in _OPERATOR_OF
+    }
+    if len(operators) != 1:
+        return None
+    op = operators.pop()
+    if op == "+":
+        value = a + b
+    elif op == "-":
+        value = a - b
+    elif op == "*":
+        value = a * b
+    else:
+        if b == 0:
+            return None
+        value = a / b
+    return f"{value:.2f}"
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 
 from src.utils.log import log
+from tools.moltbook.helpers.validation import validate_args
 
 # Paths are resolved relative to this file: tools/moltbook/ -> ../../skill-files/
 _SKILL_FILES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "skill-files")
@@ -49,6 +50,10 @@ def execute(args: dict, session_data: dict) -> str:
 
     log("Executing load_skill_files tool...")
 
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
     memory: dict = session_data.setdefault("memory", {})
     loaded: list[str] = []
     errors: list[str] = []
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+
+from src.utils.log import log
+from tools.moltbook.helpers.validation import validate_args
+
+DEFINITION: dict = {
+    "type": "function",
+    "function": {
+        "name": "prefetch",
+        "description": (
+            "Control the optional background worker that warms the Moltbook response "
+            "cache shortly before each heartbeat (/home, the following feed, the DM "
+            "check and comment threads on your active posts), so the first heartbeat "
+            "reads come from cache instead of the network."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["start", "stop", "status", "warm_now"],
+                    "description": (
+                        "'start' / 'stop' the worker, show its 'status', or 'warm_now' "
+                        "to warm the cache once immediately."
+                    ),
+                },
+                "interval_minutes": {
+                    "type": "number",
+                    "description": "Minutes between heartbeats (start only). Defaults to 30.",
+                },
+                "lead_seconds": {
+                    "type": "number",
+                    "minimum": 0,
+                    "description": (
+                        "How many seconds before each heartbeat to warm the cache "
+                        "(start only). Defaults to 120."
+                    ),
+                },
+            },
+            "required": ["action"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def execute(args: dict, session_data: dict) -> str:
+
+    log("Executing prefetch tool...")
+
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from tools.moltbook.helpers import prefetch
+
+    action: str = args["action"]
+
+    if action == "start":
+        interval_s = float(args.get("interval_minutes", prefetch.DEFAULT_INTERVAL_S / 60)) * 60
+        lead_s = float(args.get("lead_seconds", prefetch.DEFAULT_LEAD_S))
+        if interval_s <= 0 or lead_s < 0:
+            return "prefetch: 'interval_minutes' must be positive and 'lead_seconds' non-negative."
+        if not prefetch.start(interval_s, lead_s):
+            return "prefetch: the background worker is already running."
+        return f"prefetch: background worker started. {json.dumps(prefetch.status())}"
+
+    if action == "stop":
+        if not prefetch.stop():
+            return "prefetch: the background worker was not running."
+        return "prefetch: background worker stopped."
+
+    if action == "warm_now":
+        return f"prefetch: {json.dumps(prefetch.warm_cache(), indent=2)}"
+
+    return json.dumps(prefetch.status(), indent=2)
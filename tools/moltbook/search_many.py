@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+from urllib.parse import urlencode
+
+from src.utils.log import log
+from tools.moltbook.helpers.validation import validate_args
+
+DEFINITION: dict = {
+    "type": "function",
+    "function": {
+        "name": "search_many",
+        "description": (
+            "Run several semantic searches at once and get one merged, de-duplicated "
+            "result list: one entry per post, with its best similarity score, which "
+            "queries found it, and a combined rank (reciprocal rank fusion across the "
+            "queries). Use it instead of several get_data /search calls, e.g. to "
+            "explore a topic from a few angles or to check for duplicates before posting."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "queries": {
+                    "type": "array",
+                    "items": {"type": "string", "maxLength": 500},
+                    "minItems": 1,
+                    "maxItems": 10,
+                    "description": "Natural-language search queries (up to 10, each max 500 chars).",
+                },
+                "type": {
+                    "type": "string",
+                    "enum": ["posts", "comments", "all"],
+                    "description": "What to search. Defaults to 'all'.",
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 50,
+                    "description": "Results requested per query, 1-50. Defaults to 20.",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Most merged posts to return. Defaults to 20.",
+                },
+            },
+            "required": ["queries"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+_DEFAULT_LIMIT = 20
+_DEFAULT_MAX_RESULTS = 20
+
+# Reciprocal rank fusion constant: a post ranked r-th (from 1) by a query
+# scores 1 / (_RRF_K + r) for it. 60 is the usual choice.
+_RRF_K = 60
+
+# Longest content snippet returned per post.
+_MAX_SNIPPET_CHARS = 280
+
+
+def _result_list(data: object) -> list:
+    if isinstance(data, dict):
+        data = data.get("results", data.get("data", []))
+    return data if isinstance(data, list) else []
+
+
+def _similarity(item: dict) -> float:
+    try:
+        return float(item.get("similarity") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _author(item: dict) -> str | None:
+    author = item.get("author")
+    if isinstance(author, dict):
+        return author.get("name")
+    return author or item.get("author_name")
+
+
+def merge_results(ranked_lists: list[list]) -> list[dict]:
+    """Fuse per-query result lists into one entry per post, best first.
+
+    Each entry keeps the best similarity any query saw for the post, the
+    indexes of the queries that found it, and how many comment hits pointed
+    at it. Entries are ordered by reciprocal-rank-fusion score, then by best
+    similarity.
+    """
+    merged: dict[str, dict] = {}
+    for query_index, results in enumerate(ranked_lists):
+        rank = 0
+        seen_here: set[str] = set()
+        for item in results:
+            if not isinstance(item, dict):
+                continue
+            post_id = item.get("post_id") or item.get("id")
+            if post_id is None:
+                continue
+            post_id = str(post_id)
+            is_comment = item.get("type") == "comment"
+            entry = merged.setdefault(post_id, {
+                "post_id": post_id,
+                "title": None,
+                "author": None,
+                "submolt": None,
+                "snippet": None,
+                "similarity": 0.0,
+                "rrf": 0.0,
+                "queries": [],
+                "comment_hits": 0,
+            })
+            if is_comment:
+                entry["comment_hits"] += 1
+            # Only a post's best rank within one query counts.
+            if post_id not in seen_here:
+                seen_here.add(post_id)
+                rank += 1
+                entry["rrf"] += 1 / (_RRF_K + rank)
+                entry["queries"].append(query_index)
+
+            similarity = _similarity(item)
+            if similarity > entry["similarity"] or entry["snippet"] is None:
+                entry["similarity"] = max(similarity, entry["similarity"])
+                entry["snippet"] = (item.get("content") or "")[:_MAX_SNIPPET_CHARS]
+            if not is_comment:
+                entry["title"] = item.get("title") or entry["title"]
+                entry["author"] = _author(item) or entry["author"]
+            submolt = item.get("submolt")
+            if isinstance(submolt, dict):
+                submolt = submolt.get("name")
+            entry["submolt"] = entry["submolt"] or submolt or item.get("submolt_name")
+
+    ranked = sorted(merged.values(), key=lambda e: (e["rrf"], e["similarity"]), reverse=True)
+    for entry in ranked:
+        entry["rrf"] = round(entry["rrf"], 5)
+        entry["similarity"] = round(entry["similarity"], 4)
+    return ranked
+
+
+def execute(args: dict, session_data: dict) -> str:
+
+    log("Executing search_many tool...")
+
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from tools.moltbook.helpers.api import fetch_many, load_auth_headers, shared_client
+
+    queries = list(dict.fromkeys(q.strip() for q in args["queries"] if q and q.strip()))
+    if not queries:
+        return "search_many: 'queries' must contain at least one non-empty query."
+
+    search_type: str = args.get("type", "all")
+    limit = int(args.get("limit", _DEFAULT_LIMIT))
+    max_results = int(args.get("max_results", _DEFAULT_MAX_RESULTS))
+
+    headers, error = load_auth_headers("search_many")
+    if error:
+        return error
+
+    paths = [
+        "/search?" + urlencode({"q": query, "type": search_type, "limit": limit})
+        for query in queries
+    ]
+    client = shared_client()
+    results = fetch_many(client, paths, headers)
+
+    errors = {
+        query: results[path]["error"]
+        for query, path in zip(queries, paths)
+        if results[path]["error"]
+    }
+    if len(errors) == len(queries):
+        return f"search_many: every search failed: {json.dumps(errors)}"
+
+    merged = merge_results([_result_list(results[path]["data"]) for path in paths])
+    out: dict = {
+        "queries": queries,
+        "total_unique_posts": len(merged),
+        "results": merged[:max_results],
+    }
+    if errors:
+        out["errors"] = errors
+    return json.dumps(out, indent=2)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+
+from src.utils.log import log
+from tools.moltbook.helpers import submolt_directory
+from tools.moltbook.helpers.validation import validate_args
+
+DEFINITION: dict = {
+    "type": "function",
+    "function": {
+        "name": "submolt_directory",
+        "description": (
+            "Look up submolts from the local directory: name, description, size, "
+            "whether you are subscribed and your role (owner / moderator). The "
+            "directory is refreshed from /submolts only when it is older than a few "
+            "hours. Pass 'query' with your draft title or topic to get the submolts "
+            "that best fit a new post."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Topic or draft post title to match submolts against.",
+                },
+                "subscribed_only": {
+                    "type": "boolean",
+                    "description": "Only list submolts you are subscribed to.",
+                },
+                "moderated_only": {
+                    "type": "boolean",
+                    "description": "Only list submolts you own or moderate.",
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Most submolts to return. Defaults to 20.",
+                },
+                "refresh": {
+                    "type": "boolean",
+                    "description": "Re-read /submolts from the API first. Defaults to false.",
+                },
+            },
+            "required": [],
+            "additionalProperties": False,
+        },
+    },
+}
+
+_DEFAULT_LIMIT = 20
+_MAX_DESCRIPTION_CHARS = 200
+
+
+def _summary(name: str, entry: dict) -> dict:
+    return {
+        "name": name,
+        "display_name": entry.get("display_name"),
+        "description": (entry.get("description") or "")[:_MAX_DESCRIPTION_CHARS],
+        "subscribers": entry.get("subscriber_count"),
+        "subscribed": entry.get("subscribed"),
+        "your_role": entry.get("your_role"),
+    }
+
+
+def execute(args: dict, session_data: dict) -> str:
+
+    log("Executing submolt_directory tool...")
+
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from tools.moltbook.helpers.api import (
+        flush_observers,
+        get_json,
+        load_auth_headers,
+        shared_client,
+    )
+
+    query: str = (args.get("query") or "").strip()
+    limit = int(args.get("limit", _DEFAULT_LIMIT))
+    refresh = bool(args.get("refresh", False))
+
+    refresh_error = None
+    if refresh or submolt_directory.listing_is_stale():
+        headers, error = load_auth_headers("submolt_directory")
+        if error:
+            return error
+        # A fetched response updates the directory on the observer thread
+        # (see api.get_json); one served from the cache queues nothing.
+        result = get_json(shared_client(), "/submolts", headers, use_cache=not refresh)
+        refresh_error = result["error"]
+        if not refresh_error:
+            flush_observers()
+            if submolt_directory.listing_is_stale():
+                submolt_directory.observe("/submolts", result["data"])
+
+    submolts = submolt_directory.all_submolts()
+    if not submolts:
+        return f"submolt_directory: the directory is empty and could not be loaded: {refresh_error}"
+
+    if args.get("subscribed_only"):
+        submolts = {n: e for n, e in submolts.items() if e.get("subscribed")}
+    if args.get("moderated_only"):
+        submolts = {
+            n: e for n, e in submolts.items() if e.get("your_role") in submolt_directory.ROLES
+        }
+
+    if query:
+        ranked = submolt_directory.rank_for_text(query)
+        entries = [
+            {**_summary(name, submolts[name]), "matching_words": shared}
+            for name, shared in ranked
+            if name in submolts
+        ][:limit]
+    else:
+        entries = [
+            _summary(name, entry)
+            for name, entry in sorted(
+                submolts.items(),
+                key=lambda item: item[1].get("subscriber_count") or 0,
+                reverse=True,
+            )
+        ][:limit]
+
+    out: dict = {"total": len(submolts), "submolts": entries}
+    if refresh_error:
+        out["refresh_error"] = refresh_error
+    return json.dumps(out, indent=2)
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-import mimetypes
-import os
-
-import httpx
-
-from src.utils.http.helpers import (
-    apply_service_tokens_to_headers,
-    load_latest_service_tokens_from_db,
-)
 from src.utils.log import log
+from tools.moltbook.helpers import response_cache, submolt_directory
+from tools.moltbook.helpers.image_optimize import fit_image
+from tools.moltbook.helpers.upload import (
+    file_sha256,
+    last_upload_hash,
+    record_upload,
+    upload_image,
+)
+from tools.moltbook.helpers.validation import validate_args
 
 DEFINITION: dict = {
     "type": "function",
@@ -18,7 +18,8 @@ DEFINITION: dict = {
         "description": (
             "Upload an avatar or banner image for a submolt you own or moderate. "
             "Supported formats: JPEG, PNG, GIF, WebP. "
-            "Max size: 500 KB for avatar, 2 MB for banner."
+            "Max size: 500 KB for avatar, 2 MB for banner — larger or other-format "
+            "images are re-encoded and downscaled to fit automatically."
         ),
         "parameters": {
             "type": "object",
@@ -36,6 +37,14 @@ DEFINITION: dict = {
                     "type": "string",
                     "description": "Path to the image file to upload.",
                 },
+                "force": {
+                    "type": "boolean",
+                    "description": (
+                        "Upload even if this exact image was already uploaded for this "
+                        "submolt and image type. Defaults to false (identical "
+                        "re-uploads are skipped)."
+                    ),
+                },
             },
             "required": ["submolt_name", "image_type", "filepath"],
             "additionalProperties": False,
@@ -44,11 +53,11 @@ DEFINITION: dict = {
 }
 
 _BASE_URL = "https://www.moltbook.com/api/v1"
-_ALLOWED_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
 _MAX_BYTES = {
     "avatar": 500 * 1024,       # 500 KB
     "banner": 2 * 1024 * 1024,  # 2 MB
 }
+_LIMIT_LABELS = {"avatar": "500 KB", "banner": "2 MB"}
 
 
 def needs_approval(args: dict) -> bool:
@@ -60,36 +69,44 @@ def execute(args: dict, session_data: dict) -> str:
 
     log("Executing submolt_image tool...")
 
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from src.utils.http.helpers import (
+        apply_service_tokens_to_headers,
+        load_latest_service_tokens_from_db,
+    )
+    from tools.moltbook.helpers.api import flush_observers
+
     submolt_name: str = args["submolt_name"]
     image_type: str = args["image_type"]
     filepath: str = args["filepath"]
+    force: bool = bool(args.get("force", False))
 
-    # Validate format.
-    content_type, _ = mimetypes.guess_type(filepath)
-    if content_type not in _ALLOWED_TYPES:
-        return (
-            f"submolt_image: unsupported file format ({content_type!r}). "
-            "Use JPEG, PNG, GIF, or WebP."
-        )
-
-    # Validate size.
-    try:
-        size = os.path.getsize(filepath)
-    except OSError as e:
-        return f"submolt_image: could not stat file: {e}"
-    max_bytes = _MAX_BYTES[image_type]
-    if size > max_bytes:
-        limit_label = "500 KB" if image_type == "avatar" else "2 MB"
-        return f"submolt_image: file is {size} bytes, exceeds the {limit_label} limit for {image_type}."
+    flush_observers()  # roles seen in responses fetched just before
+    error = submolt_directory.role_check("submolt_image", submolt_name, submolt_directory.ROLES)
+    if error:
+        return error
 
-    # Read file.
+    # Skip identical re-uploads without touching the network.
+    upload_target = f"submolt:{submolt_name}:{image_type}"
     try:
-        with open(filepath, "rb") as f:
-            file_bytes = f.read()
+        digest = file_sha256(filepath)
     except OSError as e:
         return f"submolt_image: could not read file: {e}"
+    if not force and digest == last_upload_hash(upload_target):
+        return (
+            f"submolt_image: this exact image is already the {image_type} for "
+            f"'{submolt_name}' — nothing uploaded. Pass force=true to upload it again."
+        )
 
-    filename = os.path.basename(filepath)
+    # Validate (and if needed shrink) the image before touching the database.
+    upload_path, error = fit_image(
+        "submolt_image", filepath, _MAX_BYTES[image_type], source_hash=digest
+    )
+    if error:
+        return error
 
     # --- load moltbook service token ---
     try:
@@ -104,24 +121,21 @@ def execute(args: dict, session_data: dict) -> str:
             "Create one with: slbp service-token set moltbook <token>"
         )
 
-    # Multipart upload — omit Content-Type so httpx sets the multipart boundary.
     headers: dict[str, str] = {"Accept": "application/json"}
     headers = apply_service_tokens_to_headers(headers, tokens)
     if not any(k.lower() == "authorization" for k in headers):
         headers["Authorization"] = f"Bearer {next(iter(tokens.values()))}"
 
-    url = f"{_BASE_URL}/submolts/{submolt_name}/{image_type}"
-
-    try:
-        resp = httpx.post(
-            url,
-            files={"file": (filename, file_bytes, content_type)},
-            headers=headers,
-            timeout=30,
-            follow_redirects=True,
-        )
-    except Exception as e:
-        return f"submolt_image: HTTP error during upload: {e}"
+    resp, error = upload_image(
+        "submolt_image",
+        f"{_BASE_URL}/submolts/{submolt_name}/{image_type}",
+        upload_path,
+        headers,
+        max_bytes=_MAX_BYTES[image_type],
+        limit_label=_LIMIT_LABELS[image_type],
+    )
+    if error:
+        return error
 
     # curl -f equivalent: treat HTTP >= 400 as an error.
     if resp.status_code >= 400:
@@ -135,4 +149,7 @@ def execute(args: dict, session_data: dict) -> str:
     if not data.get("success"):
         return f"submolt_image: upload failed: {data}"
 
+    record_upload(upload_target, digest)
+    # Uploads bypass the mutation loop, so drop what it would have.
+    response_cache.clear()
     return f"submolt_image: {image_type} uploaded successfully for '{submolt_name}'."
@@ -1,14 +1,8 @@
 from __future__ import annotations
 
-from src.data import get_pool
-from src.utils.http.helpers import (
-    apply_service_tokens_to_headers,
-    load_latest_service_tokens_from_db,
-)
-from src.utils.llm.streaming import StreamingLLM
-from src.utils.sql.kv_manager import KVManager
 from src.utils.log import log
-from tools.moltbook.helpers.mutation_loop import run_mutation_loop
+from tools.moltbook.helpers import interactions, profiles
+from tools.moltbook.helpers.validation import validate_args
 
 DEFINITION: dict = {
     "type": "function",
@@ -48,91 +42,59 @@ DEFINITION: dict = {
 _BASE_URL = "https://www.moltbook.com/api/v1"
 
 
-def _load_llm_config() -> dict | None:
-    """Load just the fields needed to instantiate StreamingLLM."""
-    try:
-        pool = get_pool()
-    except Exception:
-        return None
-    with pool.get_connection() as conn:
-        kv = KVManager(conn)
-        active_token = kv.get_value("active_token")
-        if not active_token:
-            return None
-        provider = active_token["provider"]
-        token_name = active_token.get("name", "")
-        with conn.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT token_value, endpoint_url
-                FROM tokens
-                WHERE BINARY provider = BINARY %s
-                  AND BINARY token_name = BINARY %s
-                LIMIT 1
-                """,
-                (provider, token_name),
-            )
-            row = cursor.fetchone()
-        if not row:
-            return None
-        token_value, endpoint_url = row
-        model = kv.get_value("model") or None
-    return {"endpoint_url": endpoint_url, "token_value": token_value, "model": model}
-
-
 def execute(args: dict, session_data: dict) -> str:
 
     log("Executing vote tool...")
 
+    error = validate_args(DEFINITION, args)
+    if error:
+        return error
+
+    from tools.moltbook.helpers.api import flush_observers, load_auth_headers
+    from tools.moltbook.helpers.mutation_loop import (
+        mutation_succeeded,
+        run_mutation_loop,
+        verification_llm,
+    )
+
     target: str = args["target"]
     target_id: str = args["target_id"]
     direction: str = args["direction"]
 
-    if target == "comment" and direction == "down":
-        return "vote: downvoting is not supported for comments."
-
     if target == "post":
         endpoint = f"/posts/{target_id}/{'upvote' if direction == 'up' else 'downvote'}"
     else:
         endpoint = f"/comments/{target_id}/upvote"
 
-    # --- load moltbook service token ---
-    try:
-        tokens, missing = load_latest_service_tokens_from_db(["moltbook"])
-        log(repr(tokens))
-        log(repr(missing))
-    except Exception as e:
-        return f"vote: failed to load moltbook service token: {e}"
-    if missing:
-        return (
-            "vote: no service token found for 'moltbook'. "
-            "Create one with: slbp service-token set moltbook <token>"
-        )
+    base_headers, error = load_auth_headers("vote")
+    if error:
+        return error
 
-    base_headers = {"Content-Type": "application/json", "Accept": "application/json"}
-    base_headers = apply_service_tokens_to_headers(base_headers, tokens)
-    if not any(k.lower() == "authorization" for k in base_headers):
-        base_headers["Authorization"] = f"Bearer {next(iter(tokens.values()))}"
-
-    # --- load LLM config ---
-    llm_config = _load_llm_config()
-    if not llm_config:
-        return (
-            "vote: could not load LLM configuration from the database. "
-            "Make sure an active token and endpoint are configured."
-        )
-    llm = StreamingLLM(
-        endpoint=llm_config["endpoint_url"],
-        token=llm_config["token_value"],
-        model=llm_config["model"],
-        timeout_s=30,
-    )
+    llm, error = verification_llm("vote")
+    if error:
+        return error
 
-    return run_mutation_loop(
+    responses: list[dict] = []
+    result = run_mutation_loop(
         endpoint=endpoint,
         method="POST",
         llm=llm,
         base_headers=base_headers,
         base_url=_BASE_URL,
         data=None,
+        on_success=responses.append,
     )
+    if mutation_succeeded(result):
+        # Upvote responses name the author and whether we already follow them.
+        response = responses[-1] if responses else {}
+        author = response.get("author")
+        author = author.get("name") if isinstance(author, dict) else None
+        if not author:
+            flush_observers()
+            author = interactions.author_of(target_id)
+        identity, _ = profiles.own_identity(session_data, base_headers)
+        if author and not (identity and identity["name"] == author):
+            interactions.record(author, "upvote" if direction == "up" else "downvote")
+            if isinstance(response.get("already_following"), bool):
+                interactions.note_following([author], response["already_following"])
+    return result